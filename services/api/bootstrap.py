@@ -25,6 +25,12 @@ def report(exc_type, exc_val, exc_tb):
         f.write(error_data['traceback'])
 
 try:
+    # Apply pending schema migrations before the routes (and the services
+    # they import) touch the database; route modules build prepared
+    # statements and caches that assume the migrated schema.
+    from solar.migrations import run_migrations
+    run_migrations()
+
     from api.routes import app
 except Exception:
     exc_type, exc_val, exc_tb = sys.exc_info()
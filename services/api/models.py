@@ -29,7 +29,7 @@ from core.transaction import Transaction
 from core.alert import Alert
 from core.case import Case
 from core.rule import Rule
-from core.report import Report
+from core.report import Report, ReportSummary, ReportPage
 from core.audit_log import AuditLog
 from core.user import User
 
@@ -168,12 +168,16 @@ class BodyReportingServiceFileReportWithAuthorities(BaseModel):
 FileReportWithAuthoritiesOutputSchema = Report
 class BodyReportingServiceGetPendingReports(BaseModel):
   report_type: Optional[str] = None
+  limit: int = 50
+  before: Optional[Tuple[datetime, UUID]] = None
 
-GetPendingReportsOutputSchema = List[Report]
+GetPendingReportsOutputSchema = ReportPage
 class BodyReportingServiceGetFiledReports(BaseModel):
   days: int
+  limit: int = 50
+  before: Optional[Tuple[datetime, UUID]] = None
 
-GetFiledReportsOutputSchema = List[Report]
+GetFiledReportsOutputSchema = ReportPage
 class BodyRulesEngineCreateAmlRule(BaseModel):
   rule_name: str
   rule_code: str
@@ -10,7 +10,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import HTMLResponse, Response
 
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse, HTMLResponse, Response
+from fastapi.responses import JSONResponse, FileResponse, HTMLResponse, ORJSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from fastapi.security import OAuth2PasswordBearer
 
@@ -52,6 +52,9 @@ REFRESH_TOKEN_COOKIE_NAME = "refresh_token"
 
 from .models import BodyCustomerServiceCreateCustomer, CreateCustomerOutputSchema, BodyCustomerServiceUpdateCustomerRiskScore, UpdateCustomerRiskScoreOutputSchema, BodyCustomerServiceGetHighRiskCustomers, GetHighRiskCustomersOutputSchema, BodyTransactionMonitoringProcessTransaction, ProcessTransactionOutputSchema, BodyTransactionMonitoringPerformAmlMonitoring, PerformAmlMonitoringOutputSchema, BodyTransactionMonitoringGetSuspiciousTransactions, GetSuspiciousTransactionsOutputSchema, BodyCaseManagementCreateCaseFromAlerts, CreateCaseFromAlertsOutputSchema, BodyCaseManagementAssignCase, AssignCaseOutputSchema, BodyCaseManagementUpdateCaseStatus, UpdateCaseStatusOutputSchema, BodyCaseManagementAddCaseEvidence, AddCaseEvidenceOutputSchema, BodyCaseManagementConductCustomerInterview, ConductCustomerInterviewOutputSchema, BodyCaseManagementCloseCase, CloseCaseOutputSchema, BodyCaseManagementGetAssignedCases, GetAssignedCasesOutputSchema, GetOverdueCasesOutputSchema, BodyReportingServiceCreateStrReport, CreateStrReportOutputSchema, BodyReportingServiceCreateCtrReport, CreateCtrReportOutputSchema, BodyReportingServiceReviewReport, ReviewReportOutputSchema, BodyReportingServiceFileReportWithAuthorities, FileReportWithAuthoritiesOutputSchema, BodyReportingServiceGetPendingReports, GetPendingReportsOutputSchema, BodyReportingServiceGetFiledReports, GetFiledReportsOutputSchema, BodyRulesEngineCreateAmlRule, CreateAmlRuleOutputSchema, BodyRulesEngineTestRuleAgainstHistoricalData, TestRuleAgainstHistoricalDataOutputSchema, BodyRulesEngineActivateRule, ActivateRuleOutputSchema, BodyRulesEngineDeactivateRule, DeactivateRuleOutputSchema, BodyRulesEngineUpdateRuleThresholds, UpdateRuleThresholdsOutputSchema, BodyRulesEngineGetActiveRules, GetActiveRulesOutputSchema, BodyRulesEngineGetRulePerformanceMetrics, GetRulePerformanceMetricsOutputSchema, BodyAuditServiceSearchAuditLogs, SearchAuditLogsOutputSchema, BodyAuditServiceGetUserActivitySummary, GetUserActivitySummaryOutputSchema
 from core import customer_service, transaction_monitoring, case_management, reporting_service, rules_engine, audit_service
+from core import audit_writer
+from core.audit_log import AuditLog
+from core.cache import request_memo_scope
 
 
 ###############################################################################
@@ -119,13 +122,23 @@ T = TypeVar('T')
 
 app = FastAPI(
     title="New app — 6/14 @ 3:29 AM",
-    docs_url=None
+    docs_url=None,
+    # Report endpoints return large nested payloads; orjson serializes them
+    # several times faster than the stdlib encoder and handles datetime/UUID
+    # without a custom default hook.
+    default_response_class=ORJSONResponse,
 )
 
 ###############################################################################
 # Simple Request Logging Middleware
 ###############################################################################
 
+@app.middleware("http")
+async def request_memo(request: Request, call_next):
+    # Per-request memo for single-row primary-key lookups; see core.cache
+    with request_memo_scope():
+        return await call_next(request)
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     request_id = str(uuid.uuid4())[:8]
@@ -267,11 +280,14 @@ async def health_check():
 thread_pool = ThreadPoolExecutor(max_workers=4)
 
 async def run_sync_in_thread(func: Callable[..., Any], *args, **kwargs) -> Any:
-    """Runs a synchronous function in a thread pool"""
+    """Runs a synchronous function in a thread pool. The caller's context is
+    copied into the worker thread so request-scoped state (such as the
+    per-request row memo) stays visible there."""
     loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
     return await loop.run_in_executor(
         thread_pool,
-        partial(func, *args, **kwargs)
+        partial(ctx.run, partial(func, *args, **kwargs))
     )
 
 
@@ -294,12 +310,14 @@ async def custom_swagger_ui_html():
 # Auth Routes
 ##############################################################################
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)):
+    user_email = None
     try:
         base_url = os.getenv("ROUTER_BASE_URL")
         if not base_url:
             raise HTTPException(status_code=500, detail="ROUTER_BASE_URL is not set, could not authenticate user")
         decoded_token = jwt.decode(token, options={"verify_signature": False})
+        user_email = decoded_token.get("email")
         token_url = f"{base_url}/innerApp/oauth2/introspect"
         async with httpx.AsyncClient(timeout=20.0) as client:
             response = await client.post(token_url, json={"token": decoded_token["jti"], "token_type_hint": "access_token"})
@@ -310,6 +328,24 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             return user
     except Exception as e:
         print(f"get_current_user failed with error: {type(e).__name__}")
+        # Record the failed attempt; this feeds the audit writer's
+        # failed-auth window and detect_suspicious_patterns. Auditing must
+        # never block the 401 itself.
+        try:
+            audit_writer.enqueue(AuditLog(
+                event_id=str(uuid.uuid4()),
+                event_type="authentication_failed",
+                event_category="authentication",
+                user_email=user_email,
+                action="login",
+                resource_type="user",
+                description="Token authentication failed",
+                ip_address=request.client.host if request.client else None,
+                status="failure",
+                error_message=type(e).__name__
+            ))
+        except Exception:
+            logger.exception("Failed to audit authentication failure")
         raise HTTPException(status_code=401, detail="Unauthorized")
 
 def extract_domain(url):
@@ -639,7 +675,7 @@ async def reporting_service_file_report_with_authorities(body: BodyReportingServ
 
 @app.post('/api/reporting_service/get_pending_reports', response_model=GetPendingReportsOutputSchema, operation_id='reporting_service_get_pending_reports')
 async def reporting_service_get_pending_reports(body: BodyReportingServiceGetPendingReports = Body(...), current_user: User = Depends(get_current_user)) -> GetPendingReportsOutputSchema:
-    response = await run_sync_in_thread(reporting_service.get_pending_reports, user=current_user, report_type=body.report_type)
+    response = await run_sync_in_thread(reporting_service.get_pending_reports, user=current_user, report_type=body.report_type, limit=body.limit, before=body.before)
     return response
     
     
@@ -649,7 +685,7 @@ async def reporting_service_get_pending_reports(body: BodyReportingServiceGetPen
 
 @app.post('/api/reporting_service/get_filed_reports', response_model=GetFiledReportsOutputSchema, operation_id='reporting_service_get_filed_reports')
 async def reporting_service_get_filed_reports(body: BodyReportingServiceGetFiledReports = Body(...), current_user: User = Depends(get_current_user)) -> GetFiledReportsOutputSchema:
-    response = await run_sync_in_thread(reporting_service.get_filed_reports, user=current_user, days=body.days)
+    response = await run_sync_in_thread(reporting_service.get_filed_reports, user=current_user, days=body.days, limit=body.limit, before=body.before)
     return response
     
     
@@ -68,7 +68,8 @@ class Alert(Table):
     model_version: Optional[str] = None  # If ML model was used
     confidence_score: Optional[float] = None  # Model confidence (0-1)
     
-    # Audit
-    created_at: datetime = ColumnDetails(default_factory=datetime.now)
-    updated_at: datetime = ColumnDetails(default_factory=datetime.now)
+    # Audit — both stamps reuse the triggered_at clock read so a freshly
+    # constructed alert carries one consistent creation instant
+    created_at: datetime = ColumnDetails(default_factory=lambda data: data["triggered_at"])
+    updated_at: datetime = ColumnDetails(default_factory=lambda data: data["created_at"])
     created_by: Optional[uuid.UUID] = None
\ No newline at end of file
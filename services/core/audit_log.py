@@ -71,9 +71,13 @@ class AuditLog(Table):
     export_format: Optional[str] = None  # If data was exported
     records_affected: Optional[int] = None  # Number of records affected
     
-    # Timing
-    timestamp: datetime = ColumnDetails(default_factory=datetime.now)
-    event_date: datetime = ColumnDetails(default_factory=datetime.now)
+    # Timing — event_date mirrors timestamp so one clock read covers both,
+    # which also keeps the two fields consistent on bulk inserts.
+    # timestamp is part of the primary key: the partitioned table's key is
+    # (id, timestamp) because Postgres requires the partition column in any
+    # unique constraint, and sync's conflict target must match it.
+    timestamp: datetime = ColumnDetails(default_factory=datetime.now, primary_key=True)
+    event_date: datetime = ColumnDetails(default_factory=lambda data: data["timestamp"])
     
     # Metadata
     tags: Optional[Dict] = None  # Additional tags for categorization
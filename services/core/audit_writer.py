@@ -0,0 +1,153 @@
+from queue import Queue, Empty, Full
+from typing import Dict, List, Tuple
+import atexit
+import logging
+import threading
+import time
+
+from core.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+# Audit events are write-once compliance records that nothing reads back
+# within the same request, so they do not need to be flushed on the serving
+# path. Events are queued and written in batches by a background thread,
+# turning one INSERT round trip per event into one multi-row INSERT per
+# batch. On queue saturation or interpreter shutdown events fall back to
+# synchronous writes — they are never dropped.
+
+MAX_QUEUE_SIZE = 10000
+BATCH_SIZE = 100
+FLUSH_INTERVAL = 2.0  # seconds
+COPY_THRESHOLD = 20  # batches at least this large go through COPY
+
+_queue: "Queue[AuditLog]" = Queue(maxsize=MAX_QUEUE_SIZE)
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _write_batch(batch: List[AuditLog]):
+    if not batch:
+        return
+    try:
+        # audit_logs is append-only (fresh UUID per event), so larger batches
+        # can take the COPY ingest path instead of a multi-row INSERT
+        if len(batch) >= COPY_THRESHOLD:
+            AuditLog.copy_insert(batch)
+        else:
+            AuditLog.sync_many(batch)
+    except Exception as e:
+        logger.error(f"Batched audit write failed for {len(batch)} events: {str(e)}")
+        # Salvage what we can row by row so one bad event cannot sink a batch
+        for audit_log in batch:
+            try:
+                audit_log.sync()
+            except Exception as row_error:
+                logger.error(
+                    f"Dropping audit event {audit_log.event_id}: {str(row_error)}"
+                )
+
+
+def _drain(max_items: int) -> List[AuditLog]:
+    batch = []
+    while len(batch) < max_items:
+        try:
+            batch.append(_queue.get_nowait())
+        except Empty:
+            break
+    return batch
+
+
+def _run():
+    while True:
+        try:
+            first = _queue.get(timeout=FLUSH_INTERVAL)
+        except Empty:
+            continue
+        _write_batch([first] + _drain(BATCH_SIZE - 1))
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(
+                target=_run, name="audit-writer", daemon=True
+            )
+            _worker.start()
+
+
+# Failed-authentication sliding window, maintained on the write path so
+# pattern detection can read recent counts without rescanning audit_logs.
+# Hourly buckets keyed by (user_email, ip_address) stand in for the
+# Count-Min sketch suggested in the source material: the key cardinality
+# here is small enough that exact bounded counting is cheaper and simpler.
+FAILED_AUTH_WINDOW_HOURS = 24
+_MAX_TRACKED_KEYS = 4096
+
+_failed_auth_buckets: Dict[int, Dict[Tuple, int]] = {}
+_failed_auth_lock = threading.Lock()
+
+
+def _record_failed_auth(audit_log: AuditLog):
+    if audit_log.event_category != "authentication" or audit_log.status != "failure":
+        return
+    hour = int(time.time() // 3600)
+    key = (audit_log.user_email, audit_log.ip_address)
+    with _failed_auth_lock:
+        # Expire buckets that fell out of the window
+        for bucket_hour in [h for h in _failed_auth_buckets if h <= hour - FAILED_AUTH_WINDOW_HOURS]:
+            del _failed_auth_buckets[bucket_hour]
+        bucket = _failed_auth_buckets.setdefault(hour, {})
+        if key in bucket or len(bucket) < _MAX_TRACKED_KEYS:
+            bucket[key] = bucket.get(key, 0) + 1
+
+
+def get_failed_auth_counts(min_attempts: int = 1) -> List[Dict]:
+    """Aggregate failed-auth attempts per (user_email, ip_address) over the
+    sliding window, sorted by count. Only covers events seen by this process
+    since start; the audit_logs table remains the authoritative record."""
+    hour = int(time.time() // 3600)
+    totals: Dict[Tuple, int] = {}
+    with _failed_auth_lock:
+        for bucket_hour, bucket in _failed_auth_buckets.items():
+            if bucket_hour <= hour - FAILED_AUTH_WINDOW_HOURS:
+                continue
+            for key, count in bucket.items():
+                totals[key] = totals.get(key, 0) + count
+    return sorted(
+        (
+            {"user_email": email, "ip_address": ip, "failed_attempts": count}
+            for (email, ip), count in totals.items()
+            if count >= min_attempts
+        ),
+        key=lambda entry: entry["failed_attempts"],
+        reverse=True,
+    )
+
+
+def enqueue(audit_log: AuditLog):
+    """Queue an audit event for batched background insertion."""
+    _record_failed_auth(audit_log)
+    _ensure_worker()
+    try:
+        _queue.put_nowait(audit_log)
+    except Full:
+        # Backpressure: write inline rather than drop a compliance record
+        logger.warning("Audit write queue full, writing event synchronously")
+        audit_log.sync()
+
+
+def flush():
+    """Synchronously write everything currently queued. Used at shutdown and
+    available to callers that need queued events durable before proceeding."""
+    while True:
+        batch = _drain(BATCH_SIZE)
+        if not batch:
+            break
+        _write_batch(batch)
+
+
+atexit.register(flush)
@@ -0,0 +1,203 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Hashable, Optional
+import json
+import logging
+import threading
+import time
+
+from solar.config import config
+
+logger = logging.getLogger(__name__)
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after a fixed TTL.
+
+    Used as an L1 in-process cache in front of expensive aggregation queries.
+    Entries are evicted lazily on access and by LRU order once maxsize is
+    reached, so the cache stays bounded without a background sweeper.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+_redis_client = None
+_redis_init_lock = threading.Lock()
+_redis_unavailable = False
+
+def _get_redis():
+    """Lazily create the shared Redis client, or None when Redis is not
+    configured / not importable. Failures downgrade to L1-only caching."""
+    global _redis_client, _redis_unavailable
+    if _redis_client is not None or _redis_unavailable:
+        return _redis_client
+    with _redis_init_lock:
+        if _redis_client is not None or _redis_unavailable:
+            return _redis_client
+        redis_url = config.redis_url()
+        if not redis_url:
+            _redis_unavailable = True
+            return None
+        try:
+            import redis
+
+            _redis_client = redis.Redis.from_url(redis_url)
+        except Exception as e:
+            logger.warning(f"Redis cache unavailable, using in-process cache only: {str(e)}")
+            _redis_unavailable = True
+    return _redis_client
+
+class ResultCache:
+    """Cache-aside result cache for JSON-serializable report payloads.
+
+    Reads go through the in-process TTLCache first, then the shared Redis
+    tier when configured, and only then recompute. A per-key lock makes
+    concurrent misses for the same key compute once instead of stampeding
+    the database.
+    """
+
+    def __init__(self, prefix: str, maxsize: int = 128, ttl: float = 60.0):
+        self._prefix = prefix
+        self._l1 = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._ttl = ttl
+        self._key_locks = {}
+        self._key_locks_guard = threading.Lock()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._key_locks_guard:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _redis_get(self, key: str) -> Any:
+        client = _get_redis()
+        if client is None:
+            return None
+        try:
+            payload = client.get(key)
+        except Exception as e:
+            logger.warning(f"Redis read failed for {key}: {str(e)}")
+            return None
+        return json.loads(payload) if payload is not None else None
+
+    def _redis_set(self, key: str, value: Any):
+        client = _get_redis()
+        if client is None:
+            return
+        try:
+            client.set(key, json.dumps(value, default=str), ex=max(1, int(self._ttl)))
+        except Exception as e:
+            logger.warning(f"Redis write failed for {key}: {str(e)}")
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        cached = self._l1.get(key)
+        if cached is not None:
+            return cached
+
+        redis_key = f"{self._prefix}:{key}"
+        with self._lock_for(redis_key):
+            # Re-check after acquiring the lock: another thread may have
+            # finished computing while this one waited.
+            cached = self._l1.get(key)
+            if cached is not None:
+                return cached
+
+            cached = self._redis_get(redis_key)
+            if cached is None:
+                cached = compute()
+                self._redis_set(redis_key, cached)
+
+            self._l1.set(key, cached)
+            return cached
+
+    def invalidate(self, key: Hashable):
+        self._l1.delete(key)
+        client = _get_redis()
+        if client is not None:
+            try:
+                client.delete(f"{self._prefix}:{key}")
+            except Exception as e:
+                logger.warning(f"Redis delete failed for {self._prefix}:{key}: {str(e)}")
+
+# Request-scoped memoization of single-row primary-key lookups. Within one
+# API request the same case/customer/report row is often fetched by several
+# helpers; the memo makes the second and later lookups free. The contextvar
+# isolates concurrent requests, and outside an active scope fetch_by_id
+# degrades to a plain query, so background jobs need no setup.
+_request_memo: "ContextVar[Optional[dict]]" = ContextVar("request_memo", default=None)
+
+@contextmanager
+def request_memo_scope():
+    """Activate per-request memoization for the duration of one request."""
+    token = _request_memo.set({})
+    try:
+        yield
+    finally:
+        _request_memo.reset(token)
+
+def _primary_key_column(model) -> str:
+    for field_name, field_info in model.model_fields.items():
+        if field_info.json_schema_extra and field_info.json_schema_extra.get(
+            "primary_key", False
+        ):
+            return field_name
+    raise ValueError(f"{model.__name__} has no primary key defined")
+
+def fetch_by_id(model, row_id) -> Optional[Any]:
+    """Fetch a row by primary key through the request memo. Returns a model
+    instance, or None when the row does not exist."""
+    memo = _request_memo.get()
+    key = (model, row_id)
+    if memo is not None and key in memo:
+        return memo[key]
+
+    pk = _primary_key_column(model)
+    results = model.sql(
+        f"SELECT * FROM {model._get_sql_table_name()} WHERE {pk} = %(row_id)s",
+        {"row_id": row_id},
+        prepare=True
+    )
+    # Driver rows are already typed, so skip per-field re-validation
+    row = model.construct_fast(results[0]) if results else None
+
+    if memo is not None:
+        memo[key] = row
+    return row
+
+def forget_cached_row(model, row_id):
+    """Drop a memoized row after it has been mutated within the request."""
+    memo = _request_memo.get()
+    if memo is not None:
+        memo.pop((model, row_id), None)
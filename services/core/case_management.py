@@ -2,11 +2,15 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 import uuid
 
+import orjson
+
 from core.case import Case
 from core.alert import Alert
 from core.customer import Customer
 from core.transaction import Transaction
 from core.audit_log import AuditLog
+from core import audit_writer
+from solar import run_parallel
 from solar.access import User, authenticated
 
 @authenticated
@@ -18,26 +22,37 @@ def create_case_from_alerts(
     description: str,
     priority: int = 3
 ) -> Case:
-    \"\"\"Create a new investigation case from one or more alerts.\"\"\"
-    
-    # Validate alerts exist and get customer info
+    """Create a new investigation case from one or more alerts."""
+    
+    # Validate alerts exist and get customer info — one round trip for the
+    # whole batch instead of one SELECT per alert, overlapped with the
+    # independent case-number draw (a sequence gap on validation failure is
+    # harmless)
+    alert_results, case_number = run_parallel(
+        lambda: Alert.sql(
+            "SELECT * FROM alerts WHERE id = ANY(%(alert_ids)s)",
+            {"alert_ids": list(alert_ids)},
+            prepare=True
+        ),
+        generate_case_number
+    )
+
+    # Internal read-only use, so the slot-based row views are enough
+    alerts_by_id = {alert.id: alert for alert in Alert.view_rows(alert_results)}
+
+    missing = [str(alert_id) for alert_id in alert_ids if alert_id not in alerts_by_id]
+    if missing:
+        raise ValueError(f"Alerts not found: {', '.join(missing)}")
+
     alerts = []
     customer_ids = set()
     transaction_ids = []
-    
+
     for alert_id in alert_ids:
-        alert_results = Alert.sql(
-            "SELECT * FROM alerts WHERE id = %(alert_id)s",
-            {"alert_id": alert_id}
-        )
-        
-        if not alert_results:
-            raise ValueError(f"Alert {alert_id} not found")
-        
-        alert = Alert(**alert_results[0])
+        alert = alerts_by_id[alert_id]
         alerts.append(alert)
         customer_ids.add(alert.customer_id)
-        
+
         if alert.transaction_id:
             transaction_ids.append(alert.transaction_id)
     
@@ -48,11 +63,10 @@ def create_case_from_alerts(
         primary_customer = list(customer_ids)[0]
         related_customers = []
     
-    # Generate case number
-    case_number = generate_case_number()
-    
+    now = datetime.now()
+
     # Determine SLA deadline based on priority and type
-    sla_deadline = calculate_sla_deadline(priority, case_type)
+    sla_deadline = calculate_sla_deadline(priority, case_type, now=now)
     
     # Create case
     case = Case(
@@ -75,18 +89,17 @@ def create_case_from_alerts(
     
     case.sync()
     
-    # Update alerts to reference this case
-    for alert_id in alert_ids:
-        Alert.sql(
-            \"\"\"UPDATE alerts 
-               SET case_id = %(case_id)s, status = 'escalated', escalated_at = %(now)s
-               WHERE id = %(alert_id)s\"\"\",
-            {
-                "case_id": case.id,
-                "alert_id": alert_id,
-                "now": datetime.now()
-            }
-        )
+    # Update alerts to reference this case — single statement for the batch
+    Alert.sql(
+        """UPDATE alerts
+           SET case_id = %(case_id)s, status = 'escalated', escalated_at = %(now)s
+           WHERE id = ANY(%(alert_ids)s)""",
+        {
+            "case_id": case.id,
+            "alert_ids": list(alert_ids),
+            "now": now
+        }
+    )
     
     # Log case creation
     log_audit_event(
@@ -96,36 +109,44 @@ def create_case_from_alerts(
         resource_type="case",
         resource_id=case.id,
         description=f"Case {case.case_number} created from {len(alert_ids)} alerts",
-        details={"alert_ids": [str(aid) for aid in alert_ids]}
+        details={"alert_ids": list(alert_ids)}
     )
     
     return case
 
 @authenticated
 def assign_case(user: User, case_id: uuid.UUID, assigned_to: uuid.UUID, notes: Optional[str] = None) -> Case:
-    \"\"\"Assign a case to a different investigator.\"\"\"
-    
-    # Get case
+    """Assign a case to a different investigator."""
+
+    now = datetime.now()
+    notes_suffix = f"\n[{now}] Assignment change: {notes}" if notes else ""
+
+    # Fetch, mutate and write in one UPDATE ... RETURNING round trip; the
+    # prev subquery carries the old assignee out for the audit trail
     case_results = Case.sql(
-        "SELECT * FROM cases WHERE id = %(case_id)s",
-        {"case_id": case_id}
+        """UPDATE cases c
+           SET assigned_to = %(assigned_to)s,
+               assigned_at = %(now)s,
+               updated_at = %(now)s,
+               investigation_notes = c.investigation_notes || %(notes_suffix)s
+           FROM (SELECT id, assigned_to AS previous_assignee
+                 FROM cases WHERE id = %(case_id)s FOR UPDATE) prev
+           WHERE c.id = prev.id
+           RETURNING c.*, prev.previous_assignee""",
+        {
+            "case_id": case_id,
+            "assigned_to": assigned_to,
+            "now": now,
+            "notes_suffix": notes_suffix
+        }
     )
-    
+
     if not case_results:
         raise ValueError("Case not found")
-    
-    case = Case(**case_results[0])
-    old_assignee = case.assigned_to
-    
-    # Update assignment
-    case.assigned_to = assigned_to
-    case.assigned_at = datetime.now()
-    case.updated_at = datetime.now()
-    
-    if notes:
-        case.investigation_notes += f"\\n[{datetime.now()}] Assignment change: {notes}"
-    
-    case.sync()
+
+    row = case_results[0]
+    old_assignee = row.pop("previous_assignee")
+    case = Case(**row)
     
     # Log assignment change
     log_audit_event(
@@ -135,8 +156,8 @@ def assign_case(user: User, case_id: uuid.UUID, assigned_to: uuid.UUID, notes: O
         resource_type="case",
         resource_id=case.id,
         description=f"Case {case.case_number} reassigned",
-        old_values={"assigned_to": str(old_assignee)},
-        new_values={"assigned_to": str(assigned_to)}
+        old_values={"assigned_to": old_assignee},
+        new_values={"assigned_to": assigned_to}
     )
     
     return case
@@ -148,39 +169,55 @@ def update_case_status(
     new_status: str,
     notes: Optional[str] = None
 ) -> Case:
-    \"\"\"Update case status and add investigation notes.\"\"\"
-    
-    # Get case
+    """Update case status and add investigation notes."""
+
+    now = datetime.now()
+    if notes:
+        timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+        notes_suffix = f"\n[{timestamp}] Status changed to {new_status}: {notes}"
+    else:
+        notes_suffix = ""
+
+    # One UPDATE ... RETURNING replaces the fetch/mutate/sync round trips;
+    # the stage-timestamp conditionals move into CASE expressions so the
+    # transition is applied atomically, and prev carries the old status out
+    # for the audit trail
     case_results = Case.sql(
-        "SELECT * FROM cases WHERE id = %(case_id)s",
-        {"case_id": case_id}
+        """UPDATE cases c
+           SET status = %(new_status)s,
+               updated_at = %(now)s,
+               investigation_started_at = CASE
+                   WHEN %(new_status)s = 'investigating' AND c.investigation_started_at IS NULL
+                   THEN %(now)s ELSE c.investigation_started_at END,
+               review_started_at = CASE
+                   WHEN %(new_status)s = 'pending_review' AND c.review_started_at IS NULL
+                   THEN %(now)s ELSE c.review_started_at END,
+               closed_at = CASE
+                   WHEN %(new_status)s = 'closed' AND c.closed_at IS NULL
+                   THEN %(now)s ELSE c.closed_at END,
+               closed_by = CASE
+                   WHEN %(new_status)s = 'closed' AND c.closed_at IS NULL
+                   THEN %(user_id)s ELSE c.closed_by END,
+               investigation_notes = c.investigation_notes || %(notes_suffix)s
+           FROM (SELECT id, status AS previous_status
+                 FROM cases WHERE id = %(case_id)s FOR UPDATE) prev
+           WHERE c.id = prev.id
+           RETURNING c.*, prev.previous_status""",
+        {
+            "case_id": case_id,
+            "new_status": new_status,
+            "user_id": user.id,
+            "now": now,
+            "notes_suffix": notes_suffix
+        }
     )
-    
+
     if not case_results:
         raise ValueError("Case not found")
-    
-    case = Case(**case_results[0])
-    old_status = case.status
-    
-    # Update status
-    case.status = new_status
-    case.updated_at = datetime.now()
-    
-    # Update stage-specific timestamps
-    if new_status == "investigating" and not case.investigation_started_at:
-        case.investigation_started_at = datetime.now()
-    elif new_status == "pending_review" and not case.review_started_at:
-        case.review_started_at = datetime.now()
-    elif new_status == "closed" and not case.closed_at:
-        case.closed_at = datetime.now()
-        case.closed_by = user.id
-    
-    # Add notes
-    if notes:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        case.investigation_notes += f"\\n[{timestamp}] Status changed to {new_status}: {notes}"
-    
-    case.sync()
+
+    row = case_results[0]
+    old_status = row.pop("previous_status")
+    case = Case(**row)
     
     # Log status change
     log_audit_event(
@@ -204,41 +241,45 @@ def add_case_evidence(
     evidence_description: str,
     evidence_data: Dict[str, Any]
 ) -> Case:
-    \"\"\"Add evidence to a case investigation.\"\"\"
-    
-    # Get case
-    case_results = Case.sql(
-        "SELECT * FROM cases WHERE id = %(case_id)s",
-        {"case_id": case_id}
-    )
-    
-    if not case_results:
-        raise ValueError("Case not found")
-    
-    case = Case(**case_results[0])
-    
-    # Add evidence
+    """Add evidence to a case investigation."""
+
+    now = datetime.now()
+
+    # Build the evidence entry
     evidence_id = str(uuid.uuid4())
     evidence_entry = {
         "id": evidence_id,
         "type": evidence_type,
         "description": evidence_description,
         "data": evidence_data,
-        "added_by": str(user.id),
-        "added_at": datetime.now().isoformat()
+        "added_by": user.id,
+        "added_at": now
     }
-    
-    current_evidence = case.evidence_collected or {}
-    current_evidence[evidence_id] = evidence_entry
-    
-    case.evidence_collected = current_evidence
-    case.updated_at = datetime.now()
-    
-    # Add to investigation notes
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    case.investigation_notes += f"\\n[{timestamp}] Evidence added: {evidence_type} - {evidence_description}"
-    
-    case.sync()
+
+    timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+    notes_suffix = f"\n[{timestamp}] Evidence added: {evidence_type} - {evidence_description}"
+
+    # Append in SQL instead of read-modify-write: only the new entry and
+    # note suffix cross the wire, not the accumulated evidence and notes
+    case_results = Case.sql(
+        """UPDATE cases
+           SET evidence_collected = COALESCE(evidence_collected, '{}'::jsonb) || %(evidence_entry)s::jsonb,
+               investigation_notes = investigation_notes || %(notes_suffix)s,
+               updated_at = %(now)s
+           WHERE id = %(case_id)s
+           RETURNING *""",
+        {
+            "case_id": case_id,
+            "evidence_entry": orjson.dumps({evidence_id: evidence_entry}, default=str).decode(),
+            "notes_suffix": notes_suffix,
+            "now": now
+        }
+    )
+
+    if not case_results:
+        raise ValueError("Case not found")
+
+    case = Case(**case_results[0])
     
     # Log evidence addition
     log_audit_event(
@@ -262,41 +303,45 @@ def conduct_customer_interview(
     interview_notes: str,
     outcome: str
 ) -> Case:
-    \"\"\"Record a customer interview for a case.\"\"\"
-    
-    # Get case
-    case_results = Case.sql(
-        "SELECT * FROM cases WHERE id = %(case_id)s",
-        {"case_id": case_id}
-    )
-    
-    if not case_results:
-        raise ValueError("Case not found")
-    
-    case = Case(**case_results[0])
-    
-    # Add interview record
+    """Record a customer interview for a case."""
+
+    now = datetime.now()
+
+    # Build the interview record
     interview_record = {
-        "id": str(uuid.uuid4()),
-        "customer_id": str(customer_id),
-        "interviewer": str(user.id),
-        "interview_date": datetime.now().isoformat(),
+        "id": uuid.uuid4(),
+        "customer_id": customer_id,
+        "interviewer": user.id,
+        "interview_date": now,
         "method": interview_method,  # phone, email, in_person, video
         "notes": interview_notes,
         "outcome": outcome  # cooperative, uncooperative, no_response, additional_info_needed
     }
-    
-    current_interviews = case.interviews_conducted or []
-    current_interviews.append(interview_record)
-    
-    case.interviews_conducted = current_interviews
-    case.updated_at = datetime.now()
-    
-    # Add to investigation notes
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    case.investigation_notes += f"\\n[{timestamp}] Customer interview conducted via {interview_method}. Outcome: {outcome}"
-    
-    case.sync()
+
+    timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+    notes_suffix = f"\n[{timestamp}] Customer interview conducted via {interview_method}. Outcome: {outcome}"
+
+    # Append in SQL instead of read-modify-write: only the new record and
+    # note suffix cross the wire, not the accumulated interviews and notes
+    case_results = Case.sql(
+        """UPDATE cases
+           SET interviews_conducted = array_append(COALESCE(interviews_conducted, ARRAY[]::jsonb[]), %(interview_record)s::jsonb),
+               investigation_notes = investigation_notes || %(notes_suffix)s,
+               updated_at = %(now)s
+           WHERE id = %(case_id)s
+           RETURNING *""",
+        {
+            "case_id": case_id,
+            "interview_record": orjson.dumps(interview_record, default=str).decode(),
+            "notes_suffix": notes_suffix,
+            "now": now
+        }
+    )
+
+    if not case_results:
+        raise ValueError("Case not found")
+
+    case = Case(**case_results[0])
     
     # Log interview
     log_audit_event(
@@ -320,44 +365,63 @@ def close_case(
     decision: str,
     actions_taken: List[str]
 ) -> Case:
-    \"\"\"Close a case with final decision and actions.\"\"\"
-    
-    # Get case
+    """Close a case with final decision and actions."""
+
+    now = datetime.now()
+    timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+    notes_suffix = f"\n[{timestamp}] Case closed. Decision: {decision}. Reason: {closure_reason}"
+
+    # Fetch, mutate and write in one UPDATE ... RETURNING round trip. The
+    # locked prev subquery plus the status guard make closure a serialized,
+    # one-shot transition: a concurrent or retried close cannot overwrite an
+    # earlier decision.
     case_results = Case.sql(
-        "SELECT * FROM cases WHERE id = %(case_id)s",
-        {"case_id": case_id}
+        """UPDATE cases c
+           SET status = 'closed',
+               closed_at = %(now)s,
+               closed_by = %(user_id)s,
+               closure_reason = %(closure_reason)s,
+               closure_notes = %(closure_notes)s,
+               decision = %(decision)s,
+               actions_taken = %(actions_taken)s,
+               updated_at = %(now)s,
+               investigation_notes = c.investigation_notes || %(notes_suffix)s
+           FROM (SELECT id, status AS previous_status
+                 FROM cases WHERE id = %(case_id)s FOR UPDATE) prev
+           WHERE c.id = prev.id AND prev.previous_status != 'closed'
+           RETURNING c.*""",
+        {
+            "case_id": case_id,
+            "user_id": user.id,
+            "closure_reason": closure_reason,
+            "closure_notes": closure_notes,
+            "decision": decision,
+            "actions_taken": actions_taken,
+            "now": now,
+            "notes_suffix": notes_suffix
+        }
     )
-    
+
     if not case_results:
-        raise ValueError("Case not found")
-    
+        status_results = Case.sql(
+            "SELECT status FROM cases WHERE id = %(case_id)s",
+            {"case_id": case_id}
+        )
+        if not status_results:
+            raise ValueError("Case not found")
+        raise ValueError("Case is already closed")
+
     case = Case(**case_results[0])
     
-    # Update case closure information
-    case.status = "closed"
-    case.closed_at = datetime.now()
-    case.closed_by = user.id
-    case.closure_reason = closure_reason
-    case.closure_notes = closure_notes
-    case.decision = decision
-    case.actions_taken = actions_taken
-    case.updated_at = datetime.now()
-    
-    # Add final notes
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    case.investigation_notes += f"\\n[{timestamp}] Case closed. Decision: {decision}. Reason: {closure_reason}"
-    
-    case.sync()
-    
-    # Update related alerts
-    for alert_id in case.alert_ids:
+    # Update related alerts — single statement for the batch
+    if case.alert_ids:
         Alert.sql(
-            \"\"\"UPDATE alerts 
+            """UPDATE alerts
                SET status = 'closed', resolved_at = %(now)s, resolved_by = %(user_id)s,
                    resolution = %(resolution)s, resolution_notes = %(notes)s
-               WHERE id = %(alert_id)s\"\"\",
+               WHERE id = ANY(%(alert_ids)s)""",
             {
-                "alert_id": alert_id,
+                "alert_ids": list(case.alert_ids),
                 "now": datetime.now(),
                 "user_id": user.id,
                 "resolution": decision,
@@ -384,9 +448,9 @@ def close_case(
 
 @authenticated
 def get_assigned_cases(user: User, status: Optional[str] = None) -> List[Case]:
-    \"\"\"Get cases assigned to the current user.\"\"\"
+    """Get cases assigned to the current user."""
     
-    query = \"SELECT * FROM cases WHERE assigned_to = %(user_id)s\"
+    query = "SELECT * FROM cases WHERE assigned_to = %(user_id)s"
     params = {"user_id": user.id}
     
     if status:
@@ -394,8 +458,8 @@ def get_assigned_cases(user: User, status: Optional[str] = None) -> List[Case]:
         params["status"] = status
     
     query += " ORDER BY priority ASC, sla_deadline ASC"
-    
-    results = Case.sql(query, params)
+
+    results = Case.sql(query, params, prepare=True)
     cases = [Case(**result) for result in results]
     
     # Log access
@@ -412,26 +476,32 @@ def get_assigned_cases(user: User, status: Optional[str] = None) -> List[Case]:
 
 @authenticated
 def get_overdue_cases(user: User) -> List[Case]:
-    \"\"\"Get cases that are past their SLA deadline.\"\"\"
+    """Get cases that are past their SLA deadline."""
     
+    # One statement for the whole sweep: the CTE flags newly breached cases
+    # and returns them, the UNION ALL arm picks up cases already flagged, so
+    # the select-then-update round trips collapse into one
     results = Case.sql(
-        \"\"\"SELECT * FROM cases 
-           WHERE sla_deadline < %(now)s 
-           AND status NOT IN ('closed') 
-           ORDER BY sla_deadline ASC\"\"\",
-        {"now": datetime.now()}
+        """WITH newly_breached AS (
+               UPDATE cases SET sla_breached = true
+               WHERE sla_deadline < %(now)s
+               AND status NOT IN ('closed')
+               AND sla_breached = false
+               RETURNING *
+           )
+           SELECT * FROM newly_breached
+           UNION ALL
+           SELECT * FROM cases
+           WHERE sla_deadline < %(now)s
+           AND status NOT IN ('closed')
+           AND sla_breached = true
+           ORDER BY sla_deadline ASC""",
+        {"now": datetime.now()},
+        prepare=True
     )
-    
+
     cases = [Case(**result) for result in results]
     
-    # Mark as SLA breached
-    for case in cases:
-        if not case.sla_breached:
-            Case.sql(
-                "UPDATE cases SET sla_breached = true WHERE id = %(case_id)s",
-                {"case_id": case.id}
-            )
-    
     # Log access
     log_audit_event(
         user_id=user.id,
@@ -444,52 +514,65 @@ def get_overdue_cases(user: User) -> List[Case]:
     
     return cases
 
+# Months whose numbering sequence this process has already ensured exists,
+# so steady-state case creation costs a single nextval() round trip
+_case_number_periods = set()
+
 def generate_case_number() -> str:
-    \"\"\"Generate a unique case number.\"\"\"
-    year = datetime.now().year
-    month = datetime.now().month
-    
-    # Get count of cases this month
-    count_result = Case.sql(
-        \"\"\"SELECT COUNT(*) as count FROM cases 
-           WHERE EXTRACT(YEAR FROM created_at) = %(year)s 
-           AND EXTRACT(MONTH FROM created_at) = %(month)s\"\"\",
-        {"year": year, "month": month}
-    )
-    
-    count = count_result[0]["count"] + 1 if count_result else 1
-    
-    return f"CASE-{year}{month:02d}-{count:04d}"
+    """Generate a unique case number from the current month's sequence."""
+    now = datetime.now()
+    period = f"{now.year}{now.month:02d}"
 
-def calculate_sla_deadline(priority: int, case_type: str) -> datetime:
-    \"\"\"Calculate SLA deadline based on priority and type.\"\"\"
-    
-    # SLA hours based on priority
-    sla_hours = {
-        1: 4,   # Critical - 4 hours
-        2: 24,  # High - 1 day
-        3: 72,  # Medium - 3 days
-        4: 168, # Low - 1 week
-        5: 336  # Very Low - 2 weeks
-    }
-    
-    hours = sla_hours.get(priority, 72)
-    
-    # Adjust for case type
-    if case_type in ["sanctions_investigation", "terrorism_financing"]:
-        hours = max(4, hours // 2)  # More urgent
-    
-    return datetime.now() + timedelta(hours=hours)
+    # Sequence names are built only from year/month digits; one sequence per
+    # month keeps numbering dense and atomic with no COUNT(*) scan or
+    # duplicate-number race
+    if period not in _case_number_periods:
+        Case.sql(f"CREATE SEQUENCE IF NOT EXISTS case_seq_{period}")
+        _case_number_periods.add(period)
+
+    result = Case.sql(f"SELECT nextval('case_seq_{period}') as seq")
+
+    return f"CASE-{period}-{int(result[0]['seq']):04d}"
+
+# SLA hours based on priority: critical 4h, high 1d, medium 3d, low 1w,
+# very low 2w. Windows are precomputed as timedeltas per (priority, urgent)
+# with the urgent-type halving already applied, so case creation does one
+# dict lookup instead of rebuilding the table and re-deriving the hours.
+_SLA_HOURS = {1: 4, 2: 24, 3: 72, 4: 168, 5: 336}
+_SLA_URGENT_TYPES = frozenset({"sanctions_investigation", "terrorism_financing"})
+
+SLA_WINDOWS = {
+    (priority, urgent): timedelta(hours=max(4, hours // 2) if urgent else hours)
+    for priority, hours in _SLA_HOURS.items()
+    for urgent in (False, True)
+}
+SLA_DEFAULTS = {False: timedelta(hours=72), True: timedelta(hours=36)}
+
+def calculate_sla_deadline(priority: int, case_type: str, now: Optional[datetime] = None) -> datetime:
+    """Calculate SLA deadline based on priority and type."""
+
+    urgent = case_type in _SLA_URGENT_TYPES
+    window = SLA_WINDOWS.get((priority, urgent), SLA_DEFAULTS[urgent])
+
+    return (now or datetime.now()) + window
 
 def determine_case_risk_level(alerts: List[Alert]) -> str:
-    \"\"\"Determine case risk level based on associated alerts.\"\"\"
-    
-    max_risk_score = max(alert.risk_score for alert in alerts)
+    """Determine case risk level based on associated alerts."""
+
     alert_count = len(alerts)
-    
-    if max_risk_score >= 80 or alert_count >= 5:
+    if alert_count >= 5:
         return "critical"
-    elif max_risk_score >= 60 or alert_count >= 3:
+
+    # Single pass with an early exit: any score at the critical threshold
+    # decides the level without scanning the rest
+    max_risk_score = 0.0
+    for alert in alerts:
+        if alert.risk_score >= 80:
+            return "critical"
+        if alert.risk_score > max_risk_score:
+            max_risk_score = alert.risk_score
+
+    if max_risk_score >= 60 or alert_count >= 3:
         return "high"
     elif max_risk_score >= 40 or alert_count >= 2:
         return "medium"
@@ -508,7 +591,7 @@ def log_audit_event(
     new_values: Optional[Dict] = None,
     records_affected: Optional[int] = None
 ):
-    \"\"\"Log an audit event for compliance tracking.\"\"\"
+    """Log an audit event for compliance tracking."""
     
     audit_log = AuditLog(
         event_id=str(uuid.uuid4()),
@@ -525,5 +608,7 @@ def log_audit_event(
         records_affected=records_affected,
         regulatory_significance=True
     )
-    
-    audit_log.sync()
\ No newline at end of file
+
+    # Batched background insert: audit events are write-once records that
+    # nothing reads back within the request, so they stay off the serving path
+    audit_writer.enqueue(audit_log)
\ No newline at end of file
@@ -58,4 +58,10 @@ class Customer(Table):
     # Metadata
     created_at: datetime = ColumnDetails(default_factory=datetime.now)
     updated_at: datetime = ColumnDetails(default_factory=datetime.now)
-    created_by: uuid.UUID  # User who created the record
\ No newline at end of file
+    created_by: uuid.UUID  # User who created the record
+
+    @property
+    def full_name(self) -> str:
+        """Display name; mirrors the generated full_name column on the
+        customers table so Python and SQL paths render names identically."""
+        return f"{self.first_name} {self.last_name}"
\ No newline at end of file
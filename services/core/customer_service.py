@@ -2,12 +2,16 @@ from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 import uuid
 import hashlib
-import json
+
+import orjson
 
 from core.customer import Customer
 from core.transaction import Transaction
 from core.alert import Alert
 from core.audit_log import AuditLog
+from core import audit_writer
+from core.cache import fetch_by_id, forget_cached_row
+from solar import run_parallel
 from solar.access import User, authenticated, public
 
 @authenticated
@@ -32,8 +36,11 @@ def create_customer(
     address_line2: Optional[str] = None,
     postal_code: Optional[str] = None
 ) -> Customer:
-    \"\"\"Create a new customer record with initial risk assessment.\"\"\"
-    
+    """Create a new customer record with initial risk assessment."""
+
+    # Initial risk assessment — scored once, categorized from the same value
+    initial_risk_score = calculate_initial_risk_score(nationality, account_types)
+
     # Create customer record
     customer = Customer(
         user_id=user.id,
@@ -58,8 +65,8 @@ def create_customer(
         account_types=account_types,
         account_opening_date=account_opening_date,
         customer_since=datetime.now(),
-        risk_score=calculate_initial_risk_score(nationality, account_types),
-        risk_category=get_risk_category(calculate_initial_risk_score(nationality, account_types)),
+        risk_score=initial_risk_score,
+        risk_category=get_risk_category(initial_risk_score),
         created_by=user.id
     )
     
@@ -72,61 +79,72 @@ def create_customer(
         action="create",
         resource_type="customer",
         resource_id=customer.id,
-        description=f"Customer {customer.first_name} {customer.last_name} created"
+        description=f"Customer {customer.full_name} created"
     )
     
     return customer
 
 @authenticated  
 def update_customer_risk_score(user: User, customer_id: uuid.UUID) -> Customer:
-    \"\"\"Recalculate and update customer risk score based on recent activity.\"\"\"
-    
-    # Get customer
-    customer_results = Customer.sql(
-        "SELECT * FROM customers WHERE id = %(customer_id)s",
-        {"customer_id": customer_id}
-    )
+    """Recalculate and update customer risk score based on recent activity."""
     
-    if not customer_results:
+    # Get customer through the request memo — free when another helper in
+    # the same request already loaded this row
+    customer = fetch_by_id(Customer, customer_id)
+    if customer is None:
         raise ValueError("Customer not found")
-    
-    customer = Customer(**customer_results[0])
-    
-    # Get recent transactions (last 90 days)
-    recent_transactions = Transaction.sql(
-        \"\"\"SELECT * FROM transactions 
-           WHERE customer_id = %(customer_id)s 
-           AND transaction_date >= %(start_date)s
-           ORDER BY transaction_date DESC\"\"\",
-        {
-            "customer_id": customer_id,
-            "start_date": datetime.now() - timedelta(days=90)
-        }
-    )
-    
-    # Get recent alerts
-    recent_alerts = Alert.sql(
-        \"\"\"SELECT * FROM alerts 
-           WHERE customer_id = %(customer_id)s 
-           AND triggered_at >= %(start_date)s\"\"\",
-        {
-            "customer_id": customer_id,
-            "start_date": datetime.now() - timedelta(days=90)
-        }
+
+    now = datetime.now()
+    start_date = now - timedelta(days=90)
+
+    # Aggregate the 90-day activity in the database: the score only needs a
+    # handful of totals, so there is no reason to ship the full rows over.
+    # The two aggregations are independent, so their round trips overlap.
+    txn_results, alert_results = run_parallel(
+        lambda: Transaction.sql(
+            """SELECT COUNT(*) as transaction_count,
+                      COALESCE(SUM(amount), 0) as total_amount,
+                      COUNT(*) FILTER (WHERE cash_transaction) as cash_transaction_count
+               FROM transactions
+               WHERE customer_id = %(customer_id)s
+               AND transaction_date >= %(start_date)s""",
+            {
+                "customer_id": customer_id,
+                "start_date": start_date
+            }
+        ),
+        lambda: Alert.sql(
+            """SELECT COUNT(*) as alert_count FROM alerts
+               WHERE customer_id = %(customer_id)s
+               AND triggered_at >= %(start_date)s""",
+            {
+                "customer_id": customer_id,
+                "start_date": start_date
+            }
+        )
     )
-    
+    txn_totals = txn_results[0]
+    alert_totals = alert_results[0]
+
     # Calculate new risk score
-    new_risk_score = calculate_dynamic_risk_score(customer, recent_transactions, recent_alerts)
+    new_risk_score = calculate_dynamic_risk_score(
+        customer,
+        transaction_count=txn_totals["transaction_count"],
+        total_amount=float(txn_totals["total_amount"]),
+        cash_transaction_count=txn_totals["cash_transaction_count"],
+        alert_count=alert_totals["alert_count"]
+    )
     old_risk_score = customer.risk_score
-    
+
     # Update customer
     customer.risk_score = new_risk_score
     customer.risk_category = get_risk_category(new_risk_score)
-    customer.last_risk_assessment = datetime.now()
-    customer.updated_at = datetime.now()
-    
+    customer.last_risk_assessment = now
+    customer.updated_at = now
+
     customer.sync()
-    
+    forget_cached_row(Customer, customer_id)
+
     # Log risk score update
     log_audit_event(
         user_id=user.id,
@@ -141,15 +159,93 @@ def update_customer_risk_score(user: User, customer_id: uuid.UUID) -> Customer:
     
     return customer
 
+@authenticated
+def update_customer_risk_scores(user: User, customer_ids: List[uuid.UUID]) -> List[Customer]:
+    """Recalculate risk scores for a batch of customers.
+
+    Intended for scheduled recomputes: the 90-day activity for the whole
+    batch is fetched with one query per table instead of two per customer,
+    grouped by customer in Python, and written back in one batched upsert.
+    """
+
+    if not customer_ids:
+        return []
+
+    customer_results = Customer.sql(
+        "SELECT * FROM customers WHERE id = ANY(%(customer_ids)s)",
+        {"customer_ids": list(customer_ids)}
+    )
+
+    customers = [Customer(**result) for result in customer_results]
+    start_date = datetime.now() - timedelta(days=90)
+
+    # Aggregate per customer in the database; only the per-customer totals
+    # come back, however active the batch is, and the two independent
+    # aggregations run side by side
+    txn_rows, alert_rows = run_parallel(
+        lambda: Transaction.sql(
+            """SELECT customer_id,
+                      COUNT(*) as transaction_count,
+                      COALESCE(SUM(amount), 0) as total_amount,
+                      COUNT(*) FILTER (WHERE cash_transaction) as cash_transaction_count
+               FROM transactions
+               WHERE customer_id = ANY(%(customer_ids)s)
+               AND transaction_date >= %(start_date)s
+               GROUP BY customer_id""",
+            {"customer_ids": list(customer_ids), "start_date": start_date}
+        ),
+        lambda: Alert.sql(
+            """SELECT customer_id, COUNT(*) as alert_count FROM alerts
+               WHERE customer_id = ANY(%(customer_ids)s)
+               AND triggered_at >= %(start_date)s
+               GROUP BY customer_id""",
+            {"customer_ids": list(customer_ids), "start_date": start_date}
+        )
+    )
+
+    txn_totals_by_customer = {row["customer_id"]: row for row in txn_rows}
+    alert_counts_by_customer = {row["customer_id"]: row["alert_count"] for row in alert_rows}
+
+    now = datetime.now()
+    for customer in customers:
+        txn_totals = txn_totals_by_customer.get(customer.id)
+        new_risk_score = calculate_dynamic_risk_score(
+            customer,
+            transaction_count=txn_totals["transaction_count"] if txn_totals else 0,
+            total_amount=float(txn_totals["total_amount"]) if txn_totals else 0.0,
+            cash_transaction_count=txn_totals["cash_transaction_count"] if txn_totals else 0,
+            alert_count=alert_counts_by_customer.get(customer.id, 0)
+        )
+        customer.risk_score = new_risk_score
+        customer.risk_category = get_risk_category(new_risk_score)
+        customer.last_risk_assessment = now
+        customer.updated_at = now
+
+    Customer.sync_many(customers)
+    for customer in customers:
+        forget_cached_row(Customer, customer.id)
+
+    # Log batch recompute
+    log_audit_event(
+        user_id=user.id,
+        event_type="risk_scores_recomputed",
+        action="update",
+        resource_type="customer",
+        description=f"Risk scores recomputed for {len(customers)} customers",
+        records_affected=len(customers)
+    )
+
+    return customers
+
 @authenticated
 def get_high_risk_customers(user: User, limit: int = 100) -> List[Customer]:
-    \"\"\"Get customers with high risk scores for review.\"\"\"
+    """Get customers with high risk scores for review."""
     
     results = Customer.sql(
-        \"\"\"SELECT * FROM customers 
+        """SELECT * FROM customers 
            WHERE risk_category = 'high' 
            ORDER BY risk_score DESC, last_risk_assessment ASC
-           LIMIT %(limit)s\"\"\",
+           LIMIT %(limit)s""",
         {"limit": limit}
     )
     
@@ -169,42 +265,68 @@ def get_high_risk_customers(user: User, limit: int = 100) -> List[Customer]:
 
 @authenticated
 def perform_sanctions_screening(user: User, customer_id: uuid.UUID) -> Dict:
-    \"\"\"Perform sanctions and PEP screening for a customer.\"\"\"
-    
-    # Get customer
-    customer_results = Customer.sql(
-        "SELECT * FROM customers WHERE id = %(customer_id)s",
-        {"customer_id": customer_id}
-    )
+    """Perform sanctions and PEP screening for a customer."""
     
-    if not customer_results:
+    # Get customer through the request memo
+    customer = fetch_by_id(Customer, customer_id)
+    if customer is None:
         raise ValueError("Customer not found")
-    
-    customer = Customer(**customer_results[0])
-    
-    # Simulate sanctions screening (in real implementation, integrate with sanctions APIs)
-    screening_results = {
-        "sanctions_hit": False,
-        "pep_hit": False,
-        "watchlist_hit": False,
-        "screening_date": datetime.now().isoformat(),
-        "confidence_score": 0.95,
-        "sources_checked": ["UN", "OFAC", "EFCC", "PEP_LIST"]
-    }
+
+    now = datetime.now()
+
+    # Reuse a recent screening of the same identity: the providers' answer
+    # only changes when the lists or the identity do, so a fresh cached
+    # result replaces the external round trips entirely
+    identity_hash = screening_identity_hash(customer)
+    cached = Customer.sql(
+        """SELECT result FROM sanctions_screening_cache
+           WHERE identity_hash = %(identity_hash)s
+           AND checked_at >= %(fresh_after)s""",
+        {
+            "identity_hash": identity_hash,
+            "fresh_after": now - timedelta(hours=SANCTIONS_SCREENING_TTL_HOURS)
+        }
+    )
+
+    if cached:
+        screening_results = cached[0]["result"]
+    else:
+        # Simulate sanctions screening (in real implementation, integrate with sanctions APIs)
+        screening_results = {
+            "sanctions_hit": False,
+            "pep_hit": False,
+            "watchlist_hit": False,
+            "screening_date": now.isoformat(),
+            "confidence_score": 0.95,
+            "sources_checked": ["UN", "OFAC", "EFCC", "PEP_LIST"]
+        }
+
+        Customer.sql(
+            """INSERT INTO sanctions_screening_cache (identity_hash, result, checked_at)
+               VALUES (%(identity_hash)s, %(result)s::jsonb, %(now)s)
+               ON CONFLICT (identity_hash)
+               DO UPDATE SET result = EXCLUDED.result, checked_at = EXCLUDED.checked_at""",
+            {
+                "identity_hash": identity_hash,
+                "result": orjson.dumps(screening_results, default=str).decode(),
+                "now": now
+            }
+        )
     
     # Update customer record
     customer.sanctions_checked = True
     customer.pep_status = screening_results["pep_hit"]
-    customer.updated_at = datetime.now()
+    customer.updated_at = now
     
     # If hits found, increase risk score
     if screening_results["sanctions_hit"] or screening_results["pep_hit"]:
         customer.risk_score = min(100.0, customer.risk_score + 30.0)
         customer.risk_category = get_risk_category(customer.risk_score)
         customer.requires_enhanced_dd = True
-    
+
     customer.sync()
-    
+    forget_cached_row(Customer, customer_id)
+
     # Log screening
     log_audit_event(
         user_id=user.id,
@@ -212,65 +334,83 @@ def perform_sanctions_screening(user: User, customer_id: uuid.UUID) -> Dict:
         action="screening",
         resource_type="customer",
         resource_id=customer.id,
-        description=f"Sanctions screening performed for {customer.first_name} {customer.last_name}",
+        description=f"Sanctions screening performed for {customer.full_name}",
         details=screening_results
     )
     
     return screening_results
 
+# Screening results stay valid per identity for this long; name and
+# nationality are normalized before hashing so formatting differences do not
+# fragment the cache
+SANCTIONS_SCREENING_TTL_HOURS = 24
+
+def screening_identity_hash(customer: Customer) -> str:
+    """Stable hash of the identity fields the sanctions providers match on."""
+    identity = "|".join([
+        customer.first_name.strip().lower(),
+        customer.last_name.strip().lower(),
+        str(customer.date_of_birth),
+        customer.nationality.strip().upper()
+    ])
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+# High-risk countries (simplified list): Afghanistan, Iran, North Korea, Syria
+HIGH_RISK_COUNTRIES = frozenset({"AF", "IR", "KP", "SY"})
+HIGH_RISK_ACCOUNT_TYPES = frozenset({"business", "corporate", "trust"})
+
 def calculate_initial_risk_score(nationality: str, account_types: List[str]) -> float:
-    \"\"\"Calculate initial risk score based on basic customer information.\"\"\"
+    """Calculate initial risk score based on basic customer information."""
     base_score = 10.0
-    
-    # High-risk countries (simplified list)
-    high_risk_countries = ["AF", "IR", "KP", "SY"]  # Afghanistan, Iran, North Korea, Syria
-    if nationality in high_risk_countries:
+
+    if nationality in HIGH_RISK_COUNTRIES:
         base_score += 40.0
-    
+
     # Account type risk
-    high_risk_account_types = ["business", "corporate", "trust"]
-    for account_type in account_types:
-        if account_type.lower() in high_risk_account_types:
-            base_score += 15.0
-    
+    base_score += 15.0 * sum(
+        1 for account_type in account_types
+        if account_type.lower() in HIGH_RISK_ACCOUNT_TYPES
+    )
+
     return min(100.0, base_score)
 
-def calculate_dynamic_risk_score(customer: Customer, transactions: List[Dict], alerts: List[Dict]) -> float:
-    \"\"\"Calculate dynamic risk score based on customer behavior and transaction patterns.\"\"\"
+def calculate_dynamic_risk_score(
+    customer: Customer,
+    transaction_count: int,
+    total_amount: float,
+    cash_transaction_count: int,
+    alert_count: int
+) -> float:
+    """Calculate dynamic risk score from aggregated 90-day activity totals."""
     base_score = customer.risk_score
-    
+
     # Transaction volume analysis
-    total_amount = sum(float(txn.get("amount", 0)) for txn in transactions)
-    transaction_count = len(transactions)
-    
     if total_amount > 10000000:  # 10M NGN
         base_score += 20.0
     elif total_amount > 5000000:  # 5M NGN
         base_score += 10.0
-    
+
     if transaction_count > 1000:  # High frequency
         base_score += 15.0
     elif transaction_count > 500:
         base_score += 8.0
-    
+
     # Alert frequency
-    alert_count = len(alerts)
     if alert_count > 10:
         base_score += 25.0
     elif alert_count > 5:
         base_score += 15.0
     elif alert_count > 0:
         base_score += 5.0
-    
+
     # Cash transaction ratio
-    cash_transactions = [txn for txn in transactions if txn.get("cash_transaction", False)]
-    if cash_transactions and len(cash_transactions) / len(transactions) > 0.5:
+    if transaction_count and cash_transaction_count / transaction_count > 0.5:
         base_score += 20.0
-    
+
     return min(100.0, max(0.0, base_score))
 
 def get_risk_category(risk_score: float) -> str:
-    \"\"\"Convert numeric risk score to category.\"\"\"
+    """Convert numeric risk score to category."""
     if risk_score >= 70:
         return "high"
     elif risk_score >= 40:
@@ -290,7 +430,7 @@ def log_audit_event(
     new_values: Optional[Dict] = None,
     records_affected: Optional[int] = None
 ):
-    \"\"\"Log an audit event for compliance tracking.\"\"\"
+    """Log an audit event for compliance tracking."""
     
     audit_log = AuditLog(
         event_id=str(uuid.uuid4()),
@@ -307,5 +447,7 @@ def log_audit_event(
         records_affected=records_affected,
         regulatory_significance=True
     )
-    
-    audit_log.sync()
\ No newline at end of file
+
+    # Batched background insert: audit events are write-once records that
+    # nothing reads back within the request, so they stay off the serving path
+    audit_writer.enqueue(audit_log)
\ No newline at end of file
@@ -1,5 +1,6 @@
 from solar import Table, ColumnDetails
-from typing import Optional, List, Dict
+from pydantic import BaseModel
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 import uuid
 
@@ -9,7 +10,10 @@ class Report(Table):
     id: uuid.UUID = ColumnDetails(default_factory=uuid.uuid4, primary_key=True)
     
     # Report Identification
-    report_number: str  # Unique report identifier
+    # Left as None on creation: a BEFORE INSERT trigger numbers the report
+    # from the per-type monthly counter. Batch flows pre-reserve a block
+    # and pass explicit numbers, which the trigger leaves untouched.
+    report_number: Optional[str] = None  # Unique report identifier
     report_type: str  # STR, CTR, SAR, etc.
     report_category: str  # suspicious_transaction, currency_transaction, suspicious_activity
     
@@ -21,10 +25,11 @@ class Report(Table):
     alert_ids: List[uuid.UUID]  # Alerts that led to this report
     
     # Report Content
+    # Large narrative/jsonb payloads (narrative, summary, subject
+    # information, export data, ...) live in report_content — see
+    # ReportContent — so listing scans only stream the narrow columns here
     title: str
-    narrative: str  # Detailed description of suspicious activity
-    summary: str  # Executive summary
-    
+
     # Regulatory Information
     regulatory_authority: str = "NFIU"  # NFIU, CBN, EFCC, etc.
     regulatory_reference: Optional[str] = None  # Reference number from authority
@@ -38,15 +43,12 @@ class Report(Table):
     currency: str = "NGN"
     
     # Parties Involved
-    subject_information: Dict = {}  # Primary subject details
-    involved_parties: List[Dict] = []  # Other parties involved
     financial_institutions: List[Dict] = []  # Other banks/institutions involved
-    
+
     # Supporting Evidence
     supporting_documents: List[str]  # File references or descriptions
     evidence_summary: str
-    investigation_notes: str
-    
+
     # Status and Workflow
     status: str = "draft"  # draft, review, approved, filed, acknowledged
     prepared_by: uuid.UUID  # Report preparer
@@ -72,7 +74,6 @@ class Report(Table):
     
     # Follow-up
     follow_up_required: bool = False
-    follow_up_requests: List[Dict] = []  # Additional information requests
     supplementary_reports: List[uuid.UUID]  # Additional reports filed
     
     # Quality Assurance
@@ -90,8 +91,7 @@ class Report(Table):
     # Export and Formatting
     export_format: str = "XML"  # XML, PDF, JSON as per NFIU requirements
     export_version: Optional[str] = None
-    export_data: Optional[Dict] = None  # Formatted export data
-    
+
     # Performance Metrics
     preparation_time: Optional[int] = None  # Hours taken to prepare
     review_time: Optional[int] = None  # Hours taken to review
@@ -109,4 +109,31 @@ class Report(Table):
     # Audit
     created_at: datetime = ColumnDetails(default_factory=datetime.now)
     updated_at: datetime = ColumnDetails(default_factory=datetime.now)
-    created_by: uuid.UUID
\ No newline at end of file
+    created_by: uuid.UUID
+
+    def content(self) -> Optional["ReportContent"]:
+        """Fetch the cold narrative/export half of this report on demand."""
+        from core.report_content import ReportContent
+        return ReportContent.for_report(self.id)
+
+class ReportSummary(BaseModel):
+    """The columns listing endpoints actually display. Listings project
+    these instead of hydrating full Report rows."""
+
+    id: uuid.UUID
+    report_number: str
+    report_type: str
+    status: str
+    filed: bool
+    filing_date: Optional[datetime] = None
+    created_at: datetime
+    total_amount: float
+    prepared_by: uuid.UUID
+
+class ReportPage(BaseModel):
+    """One keyset-paginated page of report summaries. Pass next_cursor back
+    as `before` to fetch the following page; None means the listing is
+    exhausted."""
+
+    items: List[ReportSummary]
+    next_cursor: Optional[Tuple[datetime, uuid.UUID]] = None
\ No newline at end of file
@@ -0,0 +1,36 @@
+from solar import Table, ColumnDetails
+from typing import Optional, List, Dict
+import uuid
+
+class ReportContent(Table):
+    """Cold half of a report: the large narrative/jsonb payloads that are
+    only read when a single report is opened or exported. Keeping them out
+    of the `reports` table keeps listing and statistics scans narrow."""
+
+    __tablename__ = "report_content"
+
+    report_id: uuid.UUID = ColumnDetails(primary_key=True)
+
+    # Report Content
+    narrative: str = ""  # Detailed description of suspicious activity
+    summary: str = ""  # Executive summary
+
+    # Parties Involved
+    subject_information: Dict = {}  # Primary subject details
+    involved_parties: List[Dict] = []  # Other parties involved
+
+    # Follow-up and Investigation
+    follow_up_requests: List[Dict] = []  # Additional information requests
+    investigation_notes: str = ""
+
+    # Export and Formatting
+    export_data: Optional[Dict] = None  # Formatted export data
+
+    @classmethod
+    def for_report(cls, report_id: uuid.UUID) -> Optional["ReportContent"]:
+        """Fetch the content row for a report, or None if it has none."""
+        results = cls.sql(
+            "SELECT * FROM report_content WHERE report_id = %(report_id)s",
+            {"report_id": report_id}
+        )
+        return cls(**results[0]) if results else None
@@ -1,16 +1,63 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import uuid
-import json
 
-from core.report import Report
+import orjson
+
+from core.report import Report, ReportSummary, ReportPage
+from core.report_content import ReportContent
 from core.case import Case
 from core.customer import Customer
 from core.transaction import Transaction
 from core.alert import Alert
 from core.audit_log import AuditLog
+from core import audit_writer
+from core.cache import TTLCache, fetch_by_id, forget_cached_row
 from solar.access import User, authenticated
 
+# subject_information payloads are assembled server-side with
+# jsonb_build_object from the customers row (aliased cu), so report
+# creation ships only scalar parameters instead of building and
+# serializing the dict in Python — per report in the batch paths
+CTR_SUBJECT_INFORMATION_SQL = """jsonb_build_object(
+    'customer_id', cu.customer_id,
+    'full_name', cu.full_name,
+    'email', cu.email,
+    'phone', cu.phone,
+    'date_of_birth', cu.date_of_birth,
+    'nationality', cu.nationality,
+    'address', jsonb_build_object(
+        'line1', cu.address_line1,
+        'line2', cu.address_line2,
+        'city', cu.city,
+        'state', cu.state,
+        'country', cu.country
+    ),
+    'account_numbers', cu.account_numbers
+)"""
+
+STR_SUBJECT_INFORMATION_SQL = """jsonb_build_object(
+    'customer_id', cu.customer_id,
+    'full_name', cu.full_name,
+    'email', cu.email,
+    'phone', cu.phone,
+    'date_of_birth', cu.date_of_birth,
+    'nationality', cu.nationality,
+    'bvn', cu.bvn,
+    'nin', cu.nin,
+    'address', jsonb_build_object(
+        'line1', cu.address_line1,
+        'line2', cu.address_line2,
+        'city', cu.city,
+        'state', cu.state,
+        'country', cu.country,
+        'postal_code', cu.postal_code
+    ),
+    'account_numbers', cu.account_numbers,
+    'risk_score', cu.risk_score,
+    'pep_status', cu.pep_status
+)"""
+
 @authenticated
 def create_str_report(
     user: User,
@@ -22,68 +69,55 @@ def create_str_report(
     incident_date_from: datetime,
     incident_date_to: datetime
 ) -> Report:
-    \"\"\"Create a Suspicious Transaction Report (STR).\"\"\"
-    
-    # Get case information
-    case_results = Case.sql(
-        "SELECT * FROM cases WHERE id = %(case_id)s",
-        {"case_id": case_id}
-    )
-    
-    if not case_results:
-        raise ValueError("Case not found")
-    
-    case = Case(**case_results[0])
-    
-    # Get customer information
-    customer_results = Customer.sql(
-        "SELECT * FROM customers WHERE id = %(customer_id)s",
-        {"customer_id": case.customer_id}
-    )
-    
-    if not customer_results:
+    """Create a Suspicious Transaction Report (STR)."""
+
+    # One clock read for every timestamp this request produces
+    now = datetime.now()
+
+    # Claim the case, fetch its customer and sum the transactions in one
+    # round trip. The writable CTE both marks the case as STR-required and
+    # acts as the race guard: the row-level lock it takes plus the
+    # str_required = false predicate mean concurrent calls cannot create
+    # two STRs for the same case, with no separate pre-check SELECT
+    context = Case.sql(
+        """WITH c AS (
+               UPDATE cases
+               SET str_required = true, str_filed = false, updated_at = %(now)s
+               WHERE id = %(case_id)s AND str_required = false
+               RETURNING *
+           ),
+               cu AS (SELECT cu.* FROM customers cu JOIN c ON cu.id = c.customer_id),
+               t AS (SELECT COUNT(*) as transaction_count,
+                            COALESCE(SUM(t.amount), 0) as total_amount,
+                            COUNT(*) FILTER (WHERE t.is_suspicious) as suspicious_count
+                     FROM transactions t JOIN c ON t.id = ANY(c.transaction_ids))
+           SELECT (SELECT to_jsonb(c) FROM c) as case_row,
+                  (SELECT to_jsonb(cu) FROM cu) as customer_row,
+                  (SELECT to_jsonb(t) FROM t) as transaction_totals""",
+        {"case_id": case_id, "now": now}
+    )[0]
+
+    if not context["case_row"]:
+        # Distinguish a missing case from one whose STR already exists
+        existing = Case.sql(
+            "SELECT str_required FROM cases WHERE id = %(case_id)s",
+            {"case_id": case_id}
+        )
+        if not existing:
+            raise ValueError("Case not found")
+        raise ValueError("An STR has already been created for this case")
+
+    if not context["customer_row"]:
         raise ValueError("Customer not found")
-    
-    customer = Customer(**customer_results[0])
-    
-    # Get related transactions
-    transaction_results = Transaction.sql(
-        \"\"\"SELECT * FROM transactions WHERE id = ANY(%(transaction_ids)s)\"\"\",
-        {"transaction_ids": case.transaction_ids}
-    )
-    
-    transactions = [Transaction(**txn) for txn in transaction_results]
-    total_amount = sum(txn.amount for txn in transactions)
-    
-    # Generate report number
-    report_number = generate_report_number("STR")
-    
-    # Prepare subject information
-    subject_info = {
-        "customer_id": customer.customer_id,
-        "full_name": f"{customer.first_name} {customer.last_name}",
-        "email": customer.email,
-        "phone": customer.phone,
-        "date_of_birth": customer.date_of_birth.isoformat(),
-        "nationality": customer.nationality,
-        "bvn": customer.bvn,
-        "nin": customer.nin,
-        "address": {
-            "line1": customer.address_line1,
-            "line2": customer.address_line2,
-            "city": customer.city,
-            "state": customer.state,
-            "country": customer.country,
-            "postal_code": customer.postal_code
-        },
-        "account_numbers": customer.account_numbers,
-        "risk_score": customer.risk_score,
-        "pep_status": customer.pep_status
-    }
+
+    case = Case(**context["case_row"])
+    customer = Customer(**context["customer_row"])
+    totals = context["transaction_totals"]
+    transaction_count = totals["transaction_count"]
+    total_amount = float(totals["total_amount"])
     
     # Create STR report
     report = Report(
-        report_number=report_number,
         report_type="STR",
         report_category="suspicious_transaction",
         case_id=case_id,
@@ -91,34 +125,46 @@ def create_str_report(
         related_customers=case.related_customers,
         transaction_ids=case.transaction_ids,
         alert_ids=case.alert_ids,
-        title=f"Suspicious Transaction Report - {customer.first_name} {customer.last_name}",
-        narrative=narrative,
-        summary=f"STR filed for {suspicious_activity_type} involving {len(transactions)} transactions totaling {total_amount:,.2f} NGN",
+        title=f"Suspicious Transaction Report - {customer.full_name}",
         suspicious_activity_type=suspicious_activity_type,
         activity_description=activity_description,
         timeline_of_events=timeline_of_events,
         total_amount=total_amount,
-        subject_information=subject_info,
         incident_date_from=incident_date_from,
         incident_date_to=incident_date_to,
-        detection_date=datetime.now(),
+        detection_date=now,
         prepared_by=user.id,
-        evidence_summary=prepare_evidence_summary(case, transactions),
-        investigation_notes=case.investigation_notes or "",
+        evidence_summary=prepare_evidence_summary(
+            case, transaction_count, total_amount, totals["suspicious_count"]
+        ),
         created_by=user.id
     )
-    
-    report.sync()
-    
-    # Update case to indicate STR required and created
-    Case.sql(
-        \"\"\"UPDATE cases 
-           SET str_required = true, str_filed = false, updated_at = %(now)s
-           WHERE id = %(case_id)s\"\"\",
-        {"case_id": case_id, "now": datetime.now()}
+
+    # The BEFORE INSERT trigger numbers the report inside the insert;
+    # RETURNING brings the assigned number back in the same round trip
+    report.report_number = report.sync(returning=["report_number"])[0]["report_number"]
+
+    # subject_information is assembled in the database with
+    # jsonb_build_object straight from the customer row, skipping the
+    # Python dict build and jsonb serialization
+    ReportContent.sql(
+        f"""INSERT INTO report_content
+                (report_id, narrative, summary, subject_information, investigation_notes)
+            SELECT %(report_id)s, %(narrative)s, %(summary)s,
+                   {STR_SUBJECT_INFORMATION_SQL},
+                   %(investigation_notes)s
+            FROM customers cu WHERE cu.id = %(customer_id)s""",
+        {
+            "report_id": report.id,
+            "narrative": narrative,
+            "summary": f"STR filed for {suspicious_activity_type} involving {transaction_count} transactions totaling {total_amount:,.2f} NGN",
+            "investigation_notes": case.investigation_notes or "",
+            "customer_id": customer.id
+        }
     )
-    
-    # Log STR creation
+
+    # Log STR creation; the case row returned by the claiming CTE already
+    # carries the post-update state
     log_audit_event(
         user_id=user.id,
         event_type="str_report_created",
@@ -126,7 +172,11 @@ def create_str_report(
         resource_type="report",
         resource_id=report.id,
         description=f"STR report {report.report_number} created for case {case.case_number}",
-        details={"case_id": str(case_id), "total_amount": total_amount}
+        details={
+            "case_id": str(case_id),
+            "total_amount": total_amount,
+            "case_updated_at": case.updated_at
+        }
     )
     
     return report
@@ -139,79 +189,70 @@ def create_ctr_report(
     reporting_period_start: datetime,
     reporting_period_end: datetime
 ) -> Report:
-    \"\"\"Create a Currency Transaction Report (CTR).\"\"\"
-    
-    # Get customer information
-    customer_results = Customer.sql(
-        "SELECT * FROM customers WHERE id = %(customer_id)s",
-        {"customer_id": customer_id}
-    )
-    
-    if not customer_results:
+    """Create a Currency Transaction Report (CTR)."""
+
+    now = datetime.now()
+
+    # Get the customer and the CTR-eligible transaction totals in one round
+    # trip; the report only needs the count and sum, which the database
+    # computes without shipping the rows
+    context = Customer.sql(
+        """WITH cu AS (SELECT * FROM customers WHERE id = %(customer_id)s),
+               t AS (SELECT COUNT(*) as transaction_count,
+                            COALESCE(SUM(amount), 0) as total_amount
+                     FROM transactions
+                     WHERE id = ANY(%(transaction_ids)s)
+                     AND above_ctr_threshold = true)
+           SELECT (SELECT to_jsonb(cu) FROM cu) as customer_row,
+                  (SELECT to_jsonb(t) FROM t) as transaction_totals""",
+        {"customer_id": customer_id, "transaction_ids": transaction_ids}
+    )[0]
+
+    if not context["customer_row"]:
         raise ValueError("Customer not found")
-    
-    customer = Customer(**customer_results[0])
-    
-    # Get transactions above CTR threshold
-    transaction_results = Transaction.sql(
-        \"\"\"SELECT * FROM transactions 
-           WHERE id = ANY(%(transaction_ids)s) 
-           AND above_ctr_threshold = true\"\"\",
-        {"transaction_ids": transaction_ids}
-    )
-    
-    transactions = [Transaction(**txn) for txn in transaction_results]
-    total_amount = sum(txn.amount for txn in transactions)
-    
-    if not transactions:
+
+    customer = Customer(**context["customer_row"])
+    totals = context["transaction_totals"]
+    transaction_count = totals["transaction_count"]
+    total_amount = float(totals["total_amount"])
+
+    if not transaction_count:
         raise ValueError("No CTR-eligible transactions found")
     
-    # Generate report number
-    report_number = generate_report_number("CTR")
-    
-    # Prepare subject information
-    subject_info = {
-        "customer_id": customer.customer_id,
-        "full_name": f"{customer.first_name} {customer.last_name}",
-        "email": customer.email,
-        "phone": customer.phone,
-        "date_of_birth": customer.date_of_birth.isoformat(),
-        "nationality": customer.nationality,
-        "address": {
-            "line1": customer.address_line1,
-            "line2": customer.address_line2,
-            "city": customer.city,
-            "state": customer.state,
-            "country": customer.country
-        },
-        "account_numbers": customer.account_numbers
-    }
-    
     # Create CTR report
     report = Report(
-        report_number=report_number,
         report_type="CTR",
         report_category="currency_transaction",
         customer_id=customer_id,
         transaction_ids=transaction_ids,
-        title=f"Currency Transaction Report - {customer.first_name} {customer.last_name}",
-        narrative=f"Currency transactions above reporting threshold for period {reporting_period_start.date()} to {reporting_period_end.date()}",
-        summary=f"CTR for {len(transactions)} transactions totaling {total_amount:,.2f} NGN",
+        title=f"Currency Transaction Report - {customer.full_name}",
         suspicious_activity_type="currency_transaction",
         activity_description=f"Large currency transactions requiring regulatory reporting",
         timeline_of_events=f"Transactions occurred between {reporting_period_start.date()} and {reporting_period_end.date()}",
         total_amount=total_amount,
-        subject_information=subject_info,
         incident_date_from=reporting_period_start,
         incident_date_to=reporting_period_end,
-        detection_date=datetime.now(),
+        detection_date=now,
         prepared_by=user.id,
         filing_requirement="mandatory",
         created_by=user.id
     )
-    
-    report.sync()
-    
+
+    report.report_number = report.sync(returning=["report_number"])[0]["report_number"]
+
+    ReportContent.sql(
+        f"""INSERT INTO report_content (report_id, narrative, summary, subject_information)
+            SELECT %(report_id)s, %(narrative)s, %(summary)s,
+                   {CTR_SUBJECT_INFORMATION_SQL}
+            FROM customers cu WHERE cu.id = %(customer_id)s""",
+        {
+            "report_id": report.id,
+            "narrative": f"Currency transactions above reporting threshold for period {reporting_period_start.date()} to {reporting_period_end.date()}",
+            "summary": f"CTR for {transaction_count} transactions totaling {total_amount:,.2f} NGN",
+            "customer_id": customer.id
+        }
+    )
+
     # Log CTR creation
     log_audit_event(
         user_id=user.id,
@@ -220,36 +261,164 @@ def create_ctr_report(
         resource_type="report",
         resource_id=report.id,
         description=f"CTR report {report.report_number} created for customer {customer.customer_id}",
-        details={"customer_id": str(customer_id), "total_amount": total_amount, "transaction_count": len(transactions)}
+        details={"customer_id": str(customer_id), "total_amount": total_amount, "transaction_count": transaction_count}
     )
     
     return report
 
+@authenticated
+def create_ctr_reports_batch(
+    user: User,
+    customer_ids: List[uuid.UUID],
+    reporting_period_start: datetime,
+    reporting_period_end: datetime
+) -> List[Report]:
+    """Create CTR reports for many customers in one batch.
+
+    End-of-month runs previously called create_ctr_report once per
+    customer — N customer lookups plus N transaction lookups. The batch
+    form fetches all customers and all CTR-eligible transactions with one
+    ANY(...) query each, groups in Python, and writes the reports and
+    audit trail with one multi-row insert apiece.
+    """
+
+    customer_rows = Customer.sql(
+        "SELECT * FROM customers WHERE id = ANY(%(customer_ids)s)",
+        {"customer_ids": list(customer_ids)}
+    )
+    customers = {row["id"]: Customer.construct_fast(row) for row in customer_rows}
+
+    missing = [str(cid) for cid in customer_ids if cid not in customers]
+    if missing:
+        raise ValueError(f"Customers not found: {', '.join(missing)}")
+
+    transaction_rows = Transaction.sql(
+        """SELECT id, customer_id, amount FROM transactions
+           WHERE customer_id = ANY(%(customer_ids)s)
+           AND above_ctr_threshold = true
+           AND created_at BETWEEN %(period_start)s AND %(period_end)s""",
+        {
+            "customer_ids": list(customer_ids),
+            "period_start": reporting_period_start,
+            "period_end": reporting_period_end
+        }
+    )
+
+    transactions_by_customer: Dict[uuid.UUID, List[Dict]] = {}
+    for row in transaction_rows:
+        transactions_by_customer.setdefault(row["customer_id"], []).append(row)
+
+    eligible_ids = [cid for cid in customer_ids if cid in transactions_by_customer]
+    if not eligible_ids:
+        raise ValueError("No CTR-eligible transactions found")
+
+    report_numbers = generate_report_numbers("CTR", len(eligible_ids))
+
+    now = datetime.now()
+    reports = []
+    content_summaries = []
+    audit_logs = []
+    for report_number, customer_id in zip(report_numbers, eligible_ids):
+        customer = customers[customer_id]
+        rows = transactions_by_customer[customer_id]
+        transaction_ids = [row["id"] for row in rows]
+        transaction_count = len(rows)
+        total_amount = float(sum(row["amount"] for row in rows))
+
+        report = Report(
+            report_number=report_number,
+            report_type="CTR",
+            report_category="currency_transaction",
+            customer_id=customer_id,
+            transaction_ids=transaction_ids,
+            title=f"Currency Transaction Report - {customer.full_name}",
+            suspicious_activity_type="currency_transaction",
+            activity_description=f"Large currency transactions requiring regulatory reporting",
+            timeline_of_events=f"Transactions occurred between {reporting_period_start.date()} and {reporting_period_end.date()}",
+            total_amount=total_amount,
+            incident_date_from=reporting_period_start,
+            incident_date_to=reporting_period_end,
+            detection_date=now,
+            prepared_by=user.id,
+            filing_requirement="mandatory",
+            created_by=user.id
+        )
+        reports.append(report)
+
+        content_summaries.append(f"CTR for {transaction_count} transactions totaling {total_amount:,.2f} NGN")
+
+        audit_logs.append(AuditLog(
+            event_id=str(uuid.uuid4()),
+            event_type="ctr_report_created",
+            event_category="reporting",
+            user_id=user.id,
+            action="create",
+            resource_type="report",
+            resource_id=report.id,
+            description=f"CTR report {report.report_number} created for customer {customer.customer_id}",
+            details={"customer_id": customer_id, "total_amount": total_amount, "transaction_count": transaction_count},
+            regulatory_significance=True
+        ))
+
+    Report.sync_many(reports)
+
+    # One INSERT ... SELECT materializes every content row, with
+    # subject_information built by jsonb_build_object from the joined
+    # customer rows instead of N Python dict constructions
+    ReportContent.sql(
+        f"""INSERT INTO report_content (report_id, narrative, summary, subject_information)
+            SELECT m.report_id, %(narrative)s, m.summary,
+                   {CTR_SUBJECT_INFORMATION_SQL}
+            FROM UNNEST(
+                %(report_ids)s::uuid[],
+                %(customer_ids)s::uuid[],
+                %(summaries)s::text[]
+            ) AS m(report_id, customer_id, summary)
+            JOIN customers cu ON cu.id = m.customer_id""",
+        {
+            "narrative": f"Currency transactions above reporting threshold for period {reporting_period_start.date()} to {reporting_period_end.date()}",
+            "report_ids": [report.id for report in reports],
+            "customer_ids": eligible_ids,
+            "summaries": content_summaries
+        }
+    )
+
+    AuditLog.sync_many(audit_logs)
+
+    return reports
+
 @authenticated
 def review_report(user: User, report_id: uuid.UUID, review_notes: str, approved: bool) -> Report:
-    \"\"\"Review a report before filing.\"\"\"
+    """Review a report before filing."""
     
-    # Get report
-    report_results = Report.sql(
-        "SELECT * FROM reports WHERE id = %(report_id)s",
-        {"report_id": report_id}
+    # One UPDATE ... RETURNING applies the review and hands back the row:
+    # no hydrate-mutate-sync round trip pair, and no full-row rewrite
+    results = Report.sql(
+        """UPDATE reports
+           SET status = %(status)s,
+               reviewed_by = %(reviewer)s,
+               qa_reviewed = true,
+               qa_reviewer = %(reviewer)s,
+               qa_notes = %(notes)s,
+               qa_approved = %(approved)s,
+               updated_at = %(now)s
+           WHERE id = %(report_id)s
+           RETURNING *""",
+        {
+            "report_id": report_id,
+            "status": "approved" if approved else "review",
+            "reviewer": user.id,
+            "notes": review_notes,
+            "approved": approved,
+            "now": datetime.now()
+        }
     )
-    
-    if not report_results:
+
+    if not results:
         raise ValueError("Report not found")
-    
-    report = Report(**report_results[0])
-    
-    # Update review status
-    report.status = "approved" if approved else "review"
-    report.reviewed_by = user.id
-    report.qa_reviewed = True
-    report.qa_reviewer = user.id
-    report.qa_notes = review_notes
-    report.qa_approved = approved
-    report.updated_at = datetime.now()
-    
-    report.sync()
+
+    report = Report.construct_fast(results[0])
+    forget_cached_row(Report, report_id)
     
     # Log review
     log_audit_event(
@@ -266,53 +435,93 @@ def review_report(user: User, report_id: uuid.UUID, review_notes: str, approved:
 
 @authenticated
 def file_report_with_authorities(user: User, report_id: uuid.UUID, filing_method: str = "electronic") -> Report:
-    \"\"\"File a report with regulatory authorities.\"\"\"
-    
-    # Get report
-    report_results = Report.sql(
-        "SELECT * FROM reports WHERE id = %(report_id)s",
-        {"report_id": report_id}
-    )
-    
-    if not report_results:
+    """File a report with regulatory authorities."""
+
+    now = datetime.now()
+
+    # The report row goes through the request memo — free when an earlier
+    # helper in the same request already loaded it — and the approval check
+    # runs before the cold narrative/subject content columns are fetched,
+    # so rejected filings never touch report_content at all
+    report = fetch_by_id(Report, report_id)
+    if report is None:
         raise ValueError("Report not found")
-    
-    report = Report(**report_results[0])
-    
+
     if not report.qa_approved:
         raise ValueError("Report must be approved before filing")
-    
+
+    content_rows = ReportContent.sql(
+        "SELECT * FROM report_content WHERE report_id = %(report_id)s",
+        {"report_id": report_id}
+    )
+    content = (
+        ReportContent.construct_fast(content_rows[0])
+        if content_rows
+        else ReportContent(report_id=report.id)
+    )
+
     # Generate export data based on NFIU requirements
-    export_data = generate_nfiu_export_data(report)
-    
+    export_data = generate_nfiu_export_data(report, content)
+
     # Simulate filing with authorities (in real implementation, integrate with NFIU API)
-    filing_reference = f"NFIU-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8]}"
-    
-    # Update report
-    report.filed = True
-    report.filing_date = datetime.now()
-    report.filing_method = filing_method
-    report.filing_reference = filing_reference
-    report.filed_by = user.id
-    report.status = "filed"
-    report.export_data = export_data
-    report.updated_at = datetime.now()
-    
-    report.sync()
-    
-    # Update related case if STR
+    filing_reference = f"NFIU-{now.strftime('%Y%m%d')}-{str(uuid.uuid4())[:8]}"
+
+    # Apply the filing transition with a targeted UPDATE ... RETURNING and
+    # hydrate the result, instead of rewriting every column via sync();
+    # only the export payload goes to the content row
+    report = Report.construct_fast(Report.sql(
+        """UPDATE reports
+           SET filed = true,
+               filing_date = %(now)s,
+               filing_method = %(filing_method)s,
+               filing_reference = %(filing_reference)s,
+               filed_by = %(filed_by)s,
+               status = 'filed',
+               updated_at = %(now)s
+           WHERE id = %(report_id)s
+           RETURNING *""",
+        {
+            "report_id": report_id,
+            "now": now,
+            "filing_method": filing_method,
+            "filing_reference": filing_reference,
+            "filed_by": user.id
+        }
+    )[0])
+    forget_cached_row(Report, report_id)
+
+    ReportContent.sql(
+        """UPDATE report_content
+           SET export_data = %(export_data)s::jsonb
+           WHERE report_id = %(report_id)s""",
+        {
+            "report_id": report_id,
+            "export_data": orjson.dumps(export_data, default=str).decode()
+        }
+    )
+
+
+    filing_details = {"filing_reference": filing_reference, "filing_method": filing_method}
+
+    # Update related case if STR; RETURNING carries the stored reference
+    # back in the same round trip so the audit trail records what actually
+    # landed on the row, with no re-read
     if report.case_id and report.report_type == "STR":
-        Case.sql(
-            \"\"\"UPDATE cases 
+        case_update = Case.sql(
+            """UPDATE cases
                SET str_filed = true, str_reference = %(reference)s, str_filed_date = %(date)s
-               WHERE id = %(case_id)s\"\"\",
+               WHERE id = %(case_id)s
+               RETURNING id, str_reference""",
             {
                 "case_id": report.case_id,
                 "reference": filing_reference,
-                "date": datetime.now()
+                "date": now
             }
         )
-    
+        if case_update:
+            filing_details["case_id"] = str(case_update[0]["id"])
+            filing_details["str_reference"] = case_update[0]["str_reference"]
+
     # Log filing
     log_audit_event(
         user_id=user.id,
@@ -321,27 +530,48 @@ def file_report_with_authorities(user: User, report_id: uuid.UUID, filing_method
         resource_type="report",
         resource_id=report.id,
         description=f"Report {report.report_number} filed with {report.regulatory_authority}",
-        details={"filing_reference": filing_reference, "filing_method": filing_method}
+        details=filing_details
     )
     
     return report
 
+# What the listing endpoints display; projecting these instead of
+# SELECT * keeps the remaining wide columns off the wire entirely
+REPORT_LIST_COLUMNS = ", ".join([
+    "id", "report_number", "report_type", "status", "filed",
+    "filing_date", "created_at", "total_amount", "prepared_by"
+])
+
 @authenticated
-def get_pending_reports(user: User, report_type: Optional[str] = None) -> List[Report]:
-    \"\"\"Get reports pending review or filing.\"\"\"
-    
-    query = \"SELECT * FROM reports WHERE status IN ('draft', 'review', 'approved') AND filed = false\"
-    params = {}
-    
+def get_pending_reports(
+    user: User,
+    report_type: Optional[str] = None,
+    limit: int = 50,
+    before: Optional[Tuple[datetime, uuid.UUID]] = None
+) -> ReportPage:
+    """Get one page of reports pending review or filing.
+
+    Keyset-paginated on (created_at, id): pass the returned next_cursor as
+    `before` to walk further back, so memory and latency stay O(limit)
+    however large the backlog grows."""
+
+    query = f"SELECT {REPORT_LIST_COLUMNS} FROM reports WHERE status IN ('draft', 'review', 'approved') AND filed = false"
+    params: Dict[str, Any] = {"limit": limit}
+
     if report_type:
         query += " AND report_type = %(report_type)s"
         params["report_type"] = report_type
-    
-    query += " ORDER BY created_at DESC"
-    
+
+    if before:
+        query += " AND (created_at, id) < (%(before_ts)s, %(before_id)s)"
+        params["before_ts"], params["before_id"] = before
+
+    query += " ORDER BY created_at DESC, id DESC LIMIT %(limit)s"
+
     results = Report.sql(query, params)
-    reports = [Report(**result) for result in results]
-    
+    # Rows arrive already typed from the driver, so skip re-validation
+    reports = [ReportSummary.model_construct(**result) for result in results]
+
     # Log access
     log_audit_event(
         user_id=user.id,
@@ -351,23 +581,37 @@ def get_pending_reports(user: User, report_type: Optional[str] = None) -> List[R
         description=f"Accessed {len(reports)} pending reports",
         records_affected=len(reports)
     )
-    
-    return reports
+
+    next_cursor = (reports[-1].created_at, reports[-1].id) if len(reports) == limit else None
+    return ReportPage(items=reports, next_cursor=next_cursor)
 
 @authenticated
-def get_filed_reports(user: User, days: int = 30) -> List[Report]:
-    \"\"\"Get recently filed reports.\"\"\"
-    
-    results = Report.sql(
-        \"\"\"SELECT * FROM reports 
-           WHERE filed = true 
-           AND filing_date >= %(start_date)s
-           ORDER BY filing_date DESC\"\"\",
-        {"start_date": datetime.now() - timedelta(days=days)}
-    )
-    
-    reports = [Report(**result) for result in results]
-    
+def get_filed_reports(
+    user: User,
+    days: int = 30,
+    limit: int = 50,
+    before: Optional[Tuple[datetime, uuid.UUID]] = None
+) -> ReportPage:
+    """Get one page of recently filed reports, keyset-paginated on
+    (filing_date, id) like get_pending_reports."""
+
+    query = f"""SELECT {REPORT_LIST_COLUMNS} FROM reports
+           WHERE filed = true
+           AND filing_date >= %(start_date)s"""
+    params: Dict[str, Any] = {
+        "start_date": datetime.now() - timedelta(days=days),
+        "limit": limit
+    }
+
+    if before:
+        query += " AND (filing_date, id) < (%(before_ts)s, %(before_id)s)"
+        params["before_ts"], params["before_id"] = before
+
+    query += " ORDER BY filing_date DESC, id DESC LIMIT %(limit)s"
+
+    results = Report.sql(query, params)
+    reports = [ReportSummary.model_construct(**result) for result in results]
+
     # Log access
     log_audit_event(
         user_id=user.id,
@@ -377,63 +621,80 @@ def get_filed_reports(user: User, days: int = 30) -> List[Report]:
         description=f"Accessed {len(reports)} filed reports from last {days} days",
         records_affected=len(reports)
     )
-    
-    return reports
+
+    next_cursor = (reports[-1].filing_date, reports[-1].id) if len(reports) == limit else None
+    return ReportPage(items=reports, next_cursor=next_cursor)
 
 @authenticated
 def generate_compliance_statistics(user: User, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
-    \"\"\"Generate compliance statistics for reporting period.\"\"\"
-    
-    # STR statistics
-    str_stats = Report.sql(
-        \"\"\"SELECT COUNT(*) as total_strs, 
-                  COUNT(CASE WHEN filed = true THEN 1 END) as filed_strs,
-                  AVG(EXTRACT(EPOCH FROM (filing_date - created_at))/3600) as avg_filing_time_hours
-           FROM reports 
-           WHERE report_type = 'STR' 
-           AND created_at BETWEEN %(start_date)s AND %(end_date)s\"\"\",
+    """Generate compliance statistics for reporting period."""
+    
+    # All four aggregate groups fold into jsonb columns of a single result
+    # row, so the dashboard costs one round trip instead of four; the STR
+    # and CTR groups additionally share one scan of the reports window
+    stats_row = Report.sql(
+        """WITH report_window AS (
+               SELECT report_type, filed, filing_date, created_at
+               FROM reports
+               WHERE created_at BETWEEN %(start_date)s AND %(end_date)s
+               AND report_type IN ('STR', 'CTR')
+           ),
+           str_stats AS (
+               SELECT COUNT(*) as total_strs,
+                      COUNT(CASE WHEN filed = true THEN 1 END) as filed_strs,
+                      AVG(EXTRACT(EPOCH FROM (filing_date - created_at))/3600) as avg_filing_time_hours
+               FROM report_window
+               WHERE report_type = 'STR'
+           ),
+           ctr_stats AS (
+               SELECT COUNT(*) as total_ctrs,
+                      COUNT(CASE WHEN filed = true THEN 1 END) as filed_ctrs
+               FROM report_window
+               WHERE report_type = 'CTR'
+           ),
+           alert_stats AS (
+               SELECT COUNT(*) as total_alerts,
+                      COUNT(CASE WHEN case_id IS NOT NULL THEN 1 END) as escalated_alerts,
+                      AVG(risk_score) as avg_risk_score
+               FROM alerts
+               WHERE triggered_at BETWEEN %(start_date)s AND %(end_date)s
+           ),
+           case_stats AS (
+               SELECT COUNT(*) as total_cases,
+                      COUNT(CASE WHEN status = 'closed' THEN 1 END) as closed_cases,
+                      COUNT(CASE WHEN sla_breached = true THEN 1 END) as sla_breached_cases
+               FROM cases
+               WHERE created_at BETWEEN %(start_date)s AND %(end_date)s
+           ),
+           transaction_stats AS (
+               -- Sourced from the nightly-refreshed daily rollup instead of
+               -- rescanning transactions; historical days never change, so
+               -- only the current day can be missing from these totals
+               SELECT COALESCE(SUM(transaction_count), 0) as total_transactions,
+                      COALESCE(SUM(total_amount), 0) as total_amount,
+                      COALESCE(SUM(ctr_count), 0) as ctr_transactions,
+                      COALESCE(SUM(ctr_total), 0) as ctr_amount
+               FROM customer_daily_totals
+               WHERE day BETWEEN date_trunc('day', %(start_date)s) AND date_trunc('day', %(end_date)s)
+           )
+           SELECT (SELECT to_jsonb(s) FROM str_stats s) as str_reports,
+                  (SELECT to_jsonb(c) FROM ctr_stats c) as ctr_reports,
+                  (SELECT to_jsonb(a) FROM alert_stats a) as alerts,
+                  (SELECT to_jsonb(ca) FROM case_stats ca) as cases,
+                  (SELECT to_jsonb(t) FROM transaction_stats t) as transactions""",
         {"start_date": start_date, "end_date": end_date}
-    )
-    
-    # CTR statistics
-    ctr_stats = Report.sql(
-        \"\"\"SELECT COUNT(*) as total_ctrs,
-                  COUNT(CASE WHEN filed = true THEN 1 END) as filed_ctrs
-           FROM reports 
-           WHERE report_type = 'CTR' 
-           AND created_at BETWEEN %(start_date)s AND %(end_date)s\"\"\",
-        {"start_date": start_date, "end_date": end_date}
-    )
-    
-    # Alert statistics
-    alert_stats = Alert.sql(
-        \"\"\"SELECT COUNT(*) as total_alerts,
-                  COUNT(CASE WHEN case_id IS NOT NULL THEN 1 END) as escalated_alerts,
-                  AVG(risk_score) as avg_risk_score
-           FROM alerts 
-           WHERE triggered_at BETWEEN %(start_date)s AND %(end_date)s\"\"\",
-        {"start_date": start_date, "end_date": end_date}
-    )
-    
-    # Case statistics
-    case_stats = Case.sql(
-        \"\"\"SELECT COUNT(*) as total_cases,
-                  COUNT(CASE WHEN status = 'closed' THEN 1 END) as closed_cases,
-                  COUNT(CASE WHEN sla_breached = true THEN 1 END) as sla_breached_cases
-           FROM cases 
-           WHERE created_at BETWEEN %(start_date)s AND %(end_date)s\"\"\",
-        {"start_date": start_date, "end_date": end_date}
-    )
-    
+    )[0]
+
     statistics = {
         "reporting_period": {
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat()
         },
-        "str_reports": str_stats[0] if str_stats else {},
-        "ctr_reports": ctr_stats[0] if ctr_stats else {},
-        "alerts": alert_stats[0] if alert_stats else {},
-        "cases": case_stats[0] if case_stats else {},
+        "str_reports": stats_row["str_reports"] or {},
+        "ctr_reports": stats_row["ctr_reports"] or {},
+        "alerts": stats_row["alerts"] or {},
+        "cases": stats_row["cases"] or {},
+        "transactions": stats_row["transactions"] or {},
         "generated_at": datetime.now().isoformat()
     }
     
@@ -449,37 +710,56 @@ def generate_compliance_statistics(user: User, start_date: datetime, end_date: d
     
     return statistics
 
-def generate_report_number(report_type: str) -> str:
-    \"\"\"Generate a unique report number.\"\"\"
-    year = datetime.now().year
-    month = datetime.now().month
-    
-    # Get count of reports of this type this month
+def refresh_customer_daily_totals():
+    """Refresh the per-customer daily transaction rollup. Meant for a
+    nightly scheduler; CONCURRENTLY keeps the view readable while the
+    refresh runs."""
+    Transaction.sql("REFRESH MATERIALIZED VIEW CONCURRENTLY customer_daily_totals")
+
+def generate_report_numbers(report_type: str, count: int) -> List[str]:
+    """Reserve a block of consecutive report numbers in one counter bump.
+
+    Single-report creation leaves report_number NULL and lets the
+    fill_report_number trigger assign it inside the INSERT; batch flows
+    reserve their block here so the numbers are known up front."""
+    now = datetime.now()
+    year = now.year
+    month = now.month
+
+    # Atomic upsert on the counter row: O(1), no scan of the month's
+    # reports, and no duplicate-number race under concurrent filings
     count_result = Report.sql(
-        \"\"\"SELECT COUNT(*) as count FROM reports 
-           WHERE report_type = %(report_type)s
-           AND EXTRACT(YEAR FROM created_at) = %(year)s 
-           AND EXTRACT(MONTH FROM created_at) = %(month)s\"\"\",
-        {"report_type": report_type, "year": year, "month": month}
+        """INSERT INTO report_counters (report_type, year, month, counter)
+           VALUES (%(report_type)s, %(year)s, %(month)s, %(count)s)
+           ON CONFLICT (report_type, year, month)
+           DO UPDATE SET counter = report_counters.counter + %(count)s
+           RETURNING counter""",
+        {"report_type": report_type, "year": year, "month": month, "count": count}
     )
-    
-    count = count_result[0]["count"] + 1 if count_result else 1
-    
-    return f"{report_type}-{year}{month:02d}-{count:04d}"
 
-def prepare_evidence_summary(case: Case, transactions: List[Transaction]) -> str:
-    \"\"\"Prepare evidence summary for report.\"\"\"
-    
+    last = count_result[0]["counter"]
+
+    return [
+        f"{report_type}-{year}{month:02d}-{seq:04d}"
+        for seq in range(last - count + 1, last + 1)
+    ]
+
+def prepare_evidence_summary(
+    case: Case,
+    transaction_count: int,
+    total_amount: float,
+    suspicious_count: int
+) -> str:
+    """Prepare evidence summary for report from pre-computed transaction
+    aggregates."""
+
     evidence_points = []
-    
+
     # Transaction evidence
-    evidence_points.append(f"Analysis of {len(transactions)} transactions")
-    
-    total_amount = sum(txn.amount for txn in transactions)
+    evidence_points.append(f"Analysis of {transaction_count} transactions")
     evidence_points.append(f"Total transaction amount: {total_amount:,.2f} NGN")
-    
+
     # Suspicious patterns
-    suspicious_count = len([txn for txn in transactions if txn.is_suspicious])
     if suspicious_count > 0:
         evidence_points.append(f"{suspicious_count} transactions flagged as suspicious")
     
@@ -492,39 +772,51 @@ def prepare_evidence_summary(case: Case, transactions: List[Transaction]) -> str
     
     return "; ".join(evidence_points)
 
-def generate_nfiu_export_data(report: Report) -> Dict[str, Any]:
-    \"\"\"Generate export data in NFIU-compliant format.\"\"\"
-    
+# Export payloads are pure functions of the report row, so they are keyed by
+# (id, updated_at): any report.sync() bumps updated_at and naturally
+# invalidates the entry. Filing retries reuse the cached payload.
+_export_data_cache = TTLCache(maxsize=1024, ttl=3600.0)
+
+def generate_nfiu_export_data(report: Report, content: ReportContent) -> Dict[str, Any]:
+    """Generate export data in NFIU-compliant format."""
+
+    cache_key = (report.id, report.updated_at)
+    cached = _export_data_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # This would be the actual NFIU XML/JSON format in production
     export_data = {
         "report_header": {
             "report_number": report.report_number,
             "report_type": report.report_type,
             "filing_institution": "ProDetect Bank",
-            "filing_date": report.filing_date.isoformat() if report.filing_date else None,
+            "filing_date": report.filing_date,
             "reporting_period": {
-                "from": report.incident_date_from.isoformat(),
-                "to": report.incident_date_to.isoformat()
+                "from": report.incident_date_from,
+                "to": report.incident_date_to
             }
         },
-        "subject_information": report.subject_information,
+        "subject_information": content.subject_information,
         "transaction_details": {
             "transaction_count": len(report.transaction_ids),
             "total_amount": report.total_amount,
             "currency": report.currency
         },
-        "narrative": report.narrative,
+        "narrative": content.narrative,
         "suspicious_activity": {
             "type": report.suspicious_activity_type,
             "description": report.activity_description
         },
         "compliance_officer": {
-            "prepared_by": str(report.prepared_by),
-            "reviewed_by": str(report.reviewed_by) if report.reviewed_by else None,
-            "approved_by": str(report.approved_by) if report.approved_by else None
+            "prepared_by": report.prepared_by,
+            "reviewed_by": report.reviewed_by,
+            "approved_by": report.approved_by
         }
     }
-    
+
+    _export_data_cache.set(cache_key, export_data)
+
     return export_data
 
 def log_audit_event(
@@ -537,7 +829,7 @@ def log_audit_event(
     details: Optional[Dict] = None,
     records_affected: Optional[int] = None
 ):
-    \"\"\"Log an audit event for compliance tracking.\"\"\"
+    """Log an audit event for compliance tracking."""
     
     audit_log = AuditLog(
         event_id=str(uuid.uuid4()),
@@ -552,5 +844,5 @@ def log_audit_event(
         records_affected=records_affected,
         regulatory_significance=True
     )
-    
-    audit_log.sync()
\ No newline at end of file
+
+    audit_writer.enqueue(audit_log)
\ No newline at end of file
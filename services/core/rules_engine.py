@@ -1,11 +1,35 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import uuid
-import json
+
+from psycopg.types.json import Jsonb
 
 from core.rule import Rule
 from core.audit_log import AuditLog
+from core import audit_writer
+from core.cache import TTLCache, fetch_by_id, forget_cached_row
+from solar import run_parallel
 from solar.access import User, authenticated
+from solar.table import jsonb_dumps
+
+# CBN currency transaction reporting threshold in NGN; structuring looks
+# for clusters of transactions just below it (see detect_structuring).
+CTR_THRESHOLD_NGN = 5000000
+
+# Active rules change on the order of minutes at most, but monitoring
+# pipelines ask for them per batch. Keyed on rule_type (None = all);
+# cleared by the mutators below, the short TTL bounds staleness across
+# processes.
+_active_rules_cache = TTLCache(maxsize=32, ttl=30.0)
+
+def _invalidate_rule_caches(rule_id=None):
+    """Bust every in-process rule cache after a rule mutation."""
+    _active_rules_cache.clear()
+    if rule_id is not None:
+        forget_cached_row(Rule, rule_id)
+    # Imported lazily, mirroring the other cross-module references here
+    from core.transaction_monitoring import invalidate_rule_cache
+    invalidate_rule_cache()
 
 @authenticated
 def create_aml_rule(
@@ -27,12 +51,13 @@ def create_aml_rule(
     alert_priority: int = 3,
     regulatory_reference: Optional[str] = None
 ) -> Rule:
-    \"\"\"Create a new AML monitoring rule.\"\"\"
+    """Create a new AML monitoring rule."""
     
     # Validate rule code is unique
     existing_rules = Rule.sql(
         "SELECT COUNT(*) as count FROM rules WHERE rule_code = %(rule_code)s",
-        {"rule_code": rule_code}
+        {"rule_code": rule_code},
+        prepare=True
     )
     
     if existing_rules and existing_rules[0]["count"] > 0:
@@ -77,77 +102,101 @@ def create_aml_rule(
 
 @authenticated
 def test_rule_against_historical_data(user: User, rule_id: uuid.UUID, test_period_days: int = 30) -> Dict[str, Any]:
-    \"\"\"Test a rule against historical transaction data to evaluate effectiveness.\"\"\"
-    
-    # Get rule
-    rule_results = Rule.sql(
-        "SELECT * FROM rules WHERE id = %(rule_id)s",
-        {"rule_id": rule_id}
-    )
+    """Test a rule against historical transaction data to evaluate effectiveness."""
     
-    if not rule_results:
+    # Get rule through the request memo — a memo hit skips the query, and
+    # the memoized row skips per-field validation either way
+    rule = fetch_by_id(Rule, rule_id)
+    if rule is None:
         raise ValueError("Rule not found")
-    
-    rule = Rule(**rule_results[0])
-    
-    # Import required modules for testing
-    from core.transaction import Transaction
-    from core.customer import Customer
-    from core.transaction_monitoring import apply_monitoring_rule
-    
-    # Get historical transactions for testing
-    test_start_date = datetime.now() - timedelta(days=test_period_days)
-    
-    transactions_query = \"\"\"
-        SELECT t.*, c.* FROM transactions t
-        JOIN customers c ON t.customer_id = c.id
-        WHERE t.transaction_date >= %(start_date)s
-    \"\"\"
-    
+
+    # Translate the rule into a SQL predicate and aggregate server-side —
+    # one round trip of three counts instead of streaming up to 1000
+    # joined rows into Python and evaluating them one at a time.
+    predicate, predicate_params = rule_to_sql_predicate(rule)
+
+    now = datetime.now()
+    test_start_date = now - timedelta(days=test_period_days)
+
+    # Project only the columns this rule's predicate actually reads;
+    # is_suspicious is always needed for the true-positive count.
+    sample_columns = ["t.is_suspicious"]
+    if "amount_threshold" in rule.conditions or "cash_monitoring" in rule.conditions:
+        sample_columns.append("t.amount")
+    if "cash_monitoring" in rule.conditions:
+        sample_columns.append("t.cash_transaction")
+    if "cross_border" in rule.conditions:
+        sample_columns.append("t.cross_border")
+    if "customer_risk" in rule.conditions:
+        sample_columns += ["c.risk_category", "c.pep_status"]
+    window_clause = ""
+
+    # The 24h per-customer window aggregates force a sort, so only
+    # compute them when the rule's conditions actually read them.
+    if "velocity_check" in rule.conditions or "structuring_detection" in rule.conditions:
+        window_clause = """
+            WINDOW w AS (PARTITION BY t.customer_id ORDER BY t.transaction_date
+                         RANGE BETWEEN INTERVAL '24 hours' PRECEDING AND CURRENT ROW)"""
+    if "velocity_check" in rule.conditions:
+        sample_columns += [
+            "COUNT(*) OVER w AS txn_count_24h",
+            "COALESCE(SUM(t.amount) OVER w, 0) AS amount_24h",
+        ]
+    if "structuring_detection" in rule.conditions:
+        near_ctr = "FILTER (WHERE t.amount BETWEEN %(ctr_low)s AND %(ctr_high)s) OVER w"
+        sample_columns += [
+            f"COUNT(*) {near_ctr} AS near_ctr_count_24h",
+            f"COALESCE(SUM(t.amount) {near_ctr}, 0) AS near_ctr_amount_24h",
+        ]
+
     # Apply rule filters if specified
-    params = {"start_date": test_start_date}
-    
+    filters = ""
+    params = {"start_date": test_start_date, **predicate_params}
+
     if rule.applies_to != "all":
         if rule.customer_segments:
-            transactions_query += " AND c.risk_category = ANY(%(segments)s)"
+            filters += " AND c.risk_category = ANY(%(segments)s)"
             params["segments"] = rule.customer_segments
-    
+
     if rule.transaction_types:
-        transactions_query += " AND t.transaction_type = ANY(%(types)s)"
+        filters += " AND t.transaction_type = ANY(%(types)s)"
         params["types"] = rule.transaction_types
-    
+
     if rule.channels:
-        transactions_query += " AND t.channel = ANY(%(channels)s)"
+        filters += " AND t.channel = ANY(%(channels)s)"
         params["channels"] = rule.channels
-    
-    transactions_query += " ORDER BY t.transaction_date DESC LIMIT 1000"
-    
-    test_data = Transaction.sql(transactions_query, params)
-    
-    # Test rule against each transaction
-    true_positives = 0
-    false_positives = 0
-    total_triggers = 0
-    
-    for row in test_data:
-        # Create transaction and customer objects
-        transaction = Transaction(**{k: v for k, v in row.items() if k in Transaction.__annotations__})
-        customer = Customer(**{k: v for k, v in row.items() if k in Customer.__annotations__})
-        
-        # Apply rule
-        result = apply_monitoring_rule(transaction, customer, rule)
-        
-        if result["triggered"]:
-            total_triggers += 1
-            
-            # Simple heuristic: if transaction was already marked suspicious, it's likely a true positive
-            if transaction.is_suspicious:
-                true_positives += 1
-            else:
-                false_positives += 1
-    
+
+    # The customers join only matters when a predicate or segment filter
+    # reads customer columns; plain transaction rules scan one table.
+    join_clause = ""
+    if any(col.startswith("c.") for col in sample_columns) or "%(segments)s" in filters:
+        join_clause = "\n            JOIN customers c ON t.customer_id = c.id"
+
+    test_query = f"""
+        WITH sample AS (
+            SELECT {", ".join(sample_columns)}
+            FROM transactions t{join_clause}
+            WHERE t.transaction_date >= %(start_date)s
+            {filters}{window_clause}
+            ORDER BY t.transaction_date DESC
+            LIMIT 1000
+        )
+        SELECT COUNT(*) AS total_transactions,
+               COUNT(*) FILTER (WHERE {predicate}) AS total_triggers,
+               COUNT(*) FILTER (WHERE ({predicate}) AND is_suspicious) AS true_positives
+        FROM sample
+    """
+
+    counts = Rule.sql(test_query, params)[0]
+
+    # A transaction already marked suspicious counts as a true positive —
+    # simple heuristic.
+    total_transactions = counts["total_transactions"]
+    total_triggers = counts["total_triggers"]
+    true_positives = counts["true_positives"]
+    false_positives = total_triggers - true_positives
+
     # Calculate metrics
-    total_transactions = len(test_data)
     trigger_rate = (total_triggers / total_transactions * 100) if total_transactions > 0 else 0
     false_positive_rate = (false_positives / total_triggers * 100) if total_triggers > 0 else 0
     precision = (true_positives / total_triggers) if total_triggers > 0 else 0
@@ -162,26 +211,28 @@ def test_rule_against_historical_data(user: User, rule_id: uuid.UUID, test_perio
         "false_positive_rate_percent": round(false_positive_rate, 2),
         "precision": round(precision, 3),
         "effectiveness_score": round(precision * (1 - false_positive_rate/100), 3),
-        "test_date": datetime.now().isoformat()
+        "test_date": now.isoformat()
     }
     
     # Update rule with test results
     Rule.sql(
-        \"\"\"UPDATE rules 
+        """UPDATE rules 
            SET test_results = %(test_results)s, 
                false_positive_rate = %(fpr)s,
                effectiveness_score = %(effectiveness)s,
                last_tested = %(now)s
-           WHERE id = %(rule_id)s\"\"\",
+           WHERE id = %(rule_id)s""",
         {
             "rule_id": rule_id,
-            "test_results": json.dumps(test_results),
+            "test_results": Jsonb(test_results, dumps=jsonb_dumps),
             "fpr": false_positive_rate,
             "effectiveness": test_results["effectiveness_score"],
-            "now": datetime.now()
-        }
+            "now": now
+        },
+        prepare=True
     )
-    
+    forget_cached_row(Rule, rule_id)
+
     # Log testing
     log_audit_event(
         user_id=user.id,
@@ -197,40 +248,42 @@ def test_rule_against_historical_data(user: User, rule_id: uuid.UUID, test_perio
 
 @authenticated
 def activate_rule(user: User, rule_id: uuid.UUID) -> Rule:
-    \"\"\"Activate a rule for production monitoring.\"\"\"
-    
-    # Get rule
-    rule_results = Rule.sql(
-        "SELECT * FROM rules WHERE id = %(rule_id)s",
-        {"rule_id": rule_id}
-    )
-    
-    if not rule_results:
-        raise ValueError("Rule not found")
-    
-    rule = Rule(**rule_results[0])
-    
-    if rule.status == "active":
-        raise ValueError("Rule is already active")
-    
-    # Validate rule has been tested
-    if not rule.last_tested:
-        raise ValueError("Rule must be tested before activation")
-    
-    # Update rule status
-    old_status = rule.status
-    rule.status = "active"
-    rule.effective_date = datetime.now()
-    rule.updated_at = datetime.now()
-    rule.last_modified_by = user.id
-    
-    Rule.sql(
-        \"\"\"UPDATE rules 
+    """Activate a rule for production monitoring."""
+
+    # Validate preconditions and apply the status change atomically in one
+    # guarded UPDATE; the self-join exposes the pre-update status for the
+    # audit trail.
+    now = datetime.now()
+    updated = Rule.sql(
+        """UPDATE rules
            SET status = 'active', effective_date = %(now)s, updated_at = %(now)s, last_modified_by = %(user_id)s
-           WHERE id = %(rule_id)s\"\"\",
-        {"rule_id": rule_id, "now": datetime.now(), "user_id": user.id}
+           FROM rules old
+           WHERE rules.id = %(rule_id)s
+           AND old.id = rules.id
+           AND rules.status != 'active'
+           AND rules.last_tested IS NOT NULL
+           RETURNING rules.*, old.status AS old_status""",
+        {"rule_id": rule_id, "now": now, "user_id": user.id},
+        prepare=True
     )
-    
+
+    if not updated:
+        # Guard failed — distinguish which precondition with a cheap lookup
+        status_rows = Rule.sql(
+            "SELECT status, last_tested FROM rules WHERE id = %(rule_id)s",
+            {"rule_id": rule_id},
+            prepare=True
+        )
+        if not status_rows:
+            raise ValueError("Rule not found")
+        if status_rows[0]["status"] == "active":
+            raise ValueError("Rule is already active")
+        raise ValueError("Rule must be tested before activation")
+
+    old_status = updated[0]["old_status"]
+    rule = Rule.construct_fast(updated[0])
+    _invalidate_rule_caches(rule_id)
+
     # Log activation
     log_audit_event(
         user_id=user.id,
@@ -247,35 +300,34 @@ def activate_rule(user: User, rule_id: uuid.UUID) -> Rule:
 
 @authenticated
 def deactivate_rule(user: User, rule_id: uuid.UUID, reason: str) -> Rule:
-    \"\"\"Deactivate a rule from production monitoring.\"\"\"
-    
-    # Get rule
-    rule_results = Rule.sql(
-        "SELECT * FROM rules WHERE id = %(rule_id)s",
-        {"rule_id": rule_id}
-    )
-    
-    if not rule_results:
-        raise ValueError("Rule not found")
-    
-    rule = Rule(**rule_results[0])
-    
-    if rule.status != "active":
-        raise ValueError("Rule is not currently active")
-    
-    # Update rule status
-    old_status = rule.status
-    rule.status = "inactive"
-    rule.updated_at = datetime.now()
-    rule.last_modified_by = user.id
-    
-    Rule.sql(
-        \"\"\"UPDATE rules 
+    """Deactivate a rule from production monitoring."""
+
+    # Single guarded UPDATE: only an active rule can be deactivated, so
+    # the pre-update status is known without a prior SELECT.
+    now = datetime.now()
+    updated = Rule.sql(
+        """UPDATE rules
            SET status = 'inactive', updated_at = %(now)s, last_modified_by = %(user_id)s
-           WHERE id = %(rule_id)s\"\"\",
-        {"rule_id": rule_id, "now": datetime.now(), "user_id": user.id}
+           WHERE id = %(rule_id)s AND status = 'active'
+           RETURNING *""",
+        {"rule_id": rule_id, "now": now, "user_id": user.id},
+        prepare=True
     )
-    
+
+    if not updated:
+        exists = Rule.sql(
+            "SELECT 1 FROM rules WHERE id = %(rule_id)s",
+            {"rule_id": rule_id},
+            prepare=True
+        )
+        if not exists:
+            raise ValueError("Rule not found")
+        raise ValueError("Rule is not currently active")
+
+    old_status = "active"
+    rule = Rule.construct_fast(updated[0])
+    _invalidate_rule_caches(rule_id)
+
     # Log deactivation
     log_audit_event(
         user_id=user.id,
@@ -298,44 +350,41 @@ def update_rule_thresholds(
     new_thresholds: Dict[str, Any],
     reason: str
 ) -> Rule:
-    \"\"\"Update rule thresholds for fine-tuning.\"\"\"
-    
-    # Get rule
-    rule_results = Rule.sql(
-        "SELECT * FROM rules WHERE id = %(rule_id)s",
-        {"rule_id": rule_id}
-    )
-    
-    if not rule_results:
-        raise ValueError("Rule not found")
-    
-    rule = Rule(**rule_results[0])
-    old_thresholds = rule.thresholds
-    
-    # Update thresholds
-    rule.thresholds = new_thresholds
-    rule.updated_at = datetime.now()
-    rule.last_modified_by = user.id
-    rule.version = increment_version(rule.version)
-    rule.tuning_required = False  # Reset tuning flag
-    
-    Rule.sql(
-        \"\"\"UPDATE rules 
-           SET thresholds = %(thresholds)s, 
-               updated_at = %(now)s, 
+    """Update rule thresholds for fine-tuning."""
+
+    # Single UPDATE: the minor-version bump happens in SQL (falling back
+    # to 1.1 on malformed versions, as increment_version did) and the
+    # self-join returns the old thresholds for the audit trail.
+    now = datetime.now()
+    updated = Rule.sql(
+        r"""UPDATE rules
+           SET thresholds = %(thresholds)s,
+               updated_at = %(now)s,
                last_modified_by = %(user_id)s,
-               version = %(version)s,
+               version = CASE WHEN old.version ~ '^[0-9]+\.[0-9]+$'
+                              THEN split_part(old.version, '.', 1) || '.' || (split_part(old.version, '.', 2)::int + 1)
+                              ELSE '1.1' END,
                tuning_required = false
-           WHERE id = %(rule_id)s\"\"\",
+           FROM rules old
+           WHERE rules.id = %(rule_id)s
+           AND old.id = rules.id
+           RETURNING rules.*, old.thresholds AS old_thresholds""",
         {
             "rule_id": rule_id,
-            "thresholds": json.dumps(new_thresholds),
-            "now": datetime.now(),
-            "user_id": user.id,
-            "version": rule.version
-        }
+            "thresholds": Jsonb(new_thresholds, dumps=jsonb_dumps),
+            "now": now,
+            "user_id": user.id
+        },
+        prepare=True
     )
-    
+
+    if not updated:
+        raise ValueError("Rule not found")
+
+    old_thresholds = updated[0]["old_thresholds"]
+    rule = Rule.construct_fast(updated[0])
+    _invalidate_rule_caches(rule_id)
+
     # Log threshold update
     log_audit_event(
         user_id=user.id,
@@ -353,20 +402,24 @@ def update_rule_thresholds(
 
 @authenticated
 def get_active_rules(user: User, rule_type: Optional[str] = None) -> List[Rule]:
-    \"\"\"Get all active monitoring rules.\"\"\"
-    
-    query = "SELECT * FROM rules WHERE status = 'active'"
-    params = {}
-    
-    if rule_type:
-        query += " AND rule_type = %(rule_type)s"
-        params["rule_type"] = rule_type
-    
-    query += " ORDER BY rule_code"
-    
-    results = Rule.sql(query, params)
-    rules = [Rule(**result) for result in results]
+    """Get all active monitoring rules."""
     
+    rules = _active_rules_cache.get(rule_type)
+
+    if rules is None:
+        query = "SELECT * FROM rules WHERE status = 'active'"
+        params = {}
+
+        if rule_type:
+            query += " AND rule_type = %(rule_type)s"
+            params["rule_type"] = rule_type
+
+        query += " ORDER BY rule_code"
+
+        results = Rule.sql(query, params, prepare=True)
+        rules = [Rule.construct_fast(result) for result in results]
+        _active_rules_cache.set(rule_type, rules)
+
     # Log access
     log_audit_event(
         user_id=user.id,
@@ -381,38 +434,43 @@ def get_active_rules(user: User, rule_type: Optional[str] = None) -> List[Rule]:
 
 @authenticated
 def get_rule_performance_metrics(user: User, rule_id: uuid.UUID, days: int = 30) -> Dict[str, Any]:
-    \"\"\"Get performance metrics for a rule over a specified period.\"\"\"
-    
-    # Get rule
-    rule_results = Rule.sql(
-        "SELECT * FROM rules WHERE id = %(rule_id)s",
-        {"rule_id": rule_id}
-    )
-    
-    if not rule_results:
-        raise ValueError("Rule not found")
-    
-    rule = Rule(**rule_results[0])
+    """Get performance metrics for a rule over a specified period."""
     
     # Import Alert for metrics
     from core.alert import Alert
-    
-    # Get alerts generated by this rule in the specified period
-    start_date = datetime.now() - timedelta(days=days)
-    
-    alert_metrics = Alert.sql(
-        \"\"\"SELECT 
-               COUNT(*) as total_alerts,
-               AVG(risk_score) as avg_risk_score,
-               COUNT(CASE WHEN status = 'closed' THEN 1 END) as resolved_alerts,
-               COUNT(CASE WHEN resolution = 'false_positive' THEN 1 END) as false_positives,
-               COUNT(CASE WHEN case_id IS NOT NULL THEN 1 END) as escalated_alerts
-           FROM alerts 
-           WHERE rule_id = %(rule_id)s 
-           AND triggered_at >= %(start_date)s\"\"\",
-        {"rule_id": rule_id, "start_date": start_date}
+
+    now = datetime.now()
+    start_date = now - timedelta(days=days)
+
+    # The rule fetch and the alert aggregate are independent — overlap
+    # their round trips
+    rule_results, alert_metrics = run_parallel(
+        lambda: Rule.sql(
+            "SELECT * FROM rules WHERE id = %(rule_id)s",
+            {"rule_id": rule_id},
+            prepare=True
+        ),
+        lambda: Alert.sql(
+            """SELECT
+                   COUNT(*) as total_alerts,
+                   AVG(risk_score) as avg_risk_score,
+                   COUNT(CASE WHEN status = 'closed' THEN 1 END) as resolved_alerts,
+                   COUNT(CASE WHEN resolution = 'false_positive' THEN 1 END) as false_positives,
+                   COUNT(CASE WHEN case_id IS NOT NULL THEN 1 END) as escalated_alerts
+               FROM alerts
+               WHERE rule_id = %(rule_id)s
+               AND triggered_at >= %(start_date)s""",
+            {"rule_id": rule_id, "start_date": start_date},
+            prepare=True
+        ),
     )
-    
+
+    if not rule_results:
+        raise ValueError("Rule not found")
+
+    # Only rule_name/rule_code/id are read — a view is enough
+    rule = Rule.view_rows(rule_results)[0]
+
     metrics = alert_metrics[0] if alert_metrics else {}
     
     # Calculate derived metrics
@@ -440,21 +498,25 @@ def get_rule_performance_metrics(user: User, rule_id: uuid.UUID, days: int = 30)
         "resolution_rate_percent": round(resolution_rate, 2),
         "effectiveness_score": round((1 - false_positive_rate/100) * (escalation_rate/100), 3),
         "requires_tuning": false_positive_rate > 70 or escalation_rate < 10,
-        "generated_at": datetime.now().isoformat()
+        "generated_at": now.isoformat()
     }
     
-    # Update rule performance data
-    Rule.sql(
-        \"\"\"UPDATE rules 
-           SET performance_reviewed = %(now)s,
-               tuning_required = %(tuning_required)s
-           WHERE id = %(rule_id)s\"\"\",
-        {
-            "rule_id": rule_id,
-            "now": datetime.now(),
-            "tuning_required": performance_metrics["requires_tuning"]
-        }
-    )
+    # Update rule performance data. Rules with no alerts in the period
+    # have nothing to record — skip the write unless this is their first
+    # ever review, so idle rules don't generate write traffic.
+    if total_alerts > 0 or rule.performance_reviewed is None:
+        Rule.sql(
+            """UPDATE rules
+               SET performance_reviewed = %(now)s,
+                   tuning_required = %(tuning_required)s
+               WHERE id = %(rule_id)s""",
+            {
+                "rule_id": rule_id,
+                "now": now,
+                "tuning_required": performance_metrics["requires_tuning"]
+            },
+            prepare=True
+        )
     
     # Log metrics access
     log_audit_event(
@@ -469,97 +531,122 @@ def get_rule_performance_metrics(user: User, rule_id: uuid.UUID, days: int = 30)
     
     return performance_metrics
 
+# The standard CBN rule set is static — build it once at import time
+# instead of reallocating the dict literals on every call.
+_STANDARD_CBN_RULES = (
+    {
+        "rule_name": "High Value Cash Transaction",
+        "rule_code": "CBN-CASH-001",
+        "rule_type": "transaction_monitoring",
+        "category": "aml",
+        "description": "Monitor cash transactions above CBN reporting threshold",
+        "business_justification": "CBN requires reporting of cash transactions above 5M NGN",
+        "regulatory_reference": "CBN AML/CFT Guidelines Section 4.2",
+        "conditions": {"amount_threshold": True, "cash_monitoring": True},
+        "thresholds": {"amount": 5000000, "cash_amount": 5000000},
+        "transaction_types": ["deposit", "withdrawal"],
+        "risk_weight": 1.5,
+        "severity_level": "high",
+        "alert_priority": 2
+    },
+    {
+        "rule_name": "Rapid Transaction Velocity",
+        "rule_code": "CBN-VEL-001",
+        "rule_type": "transaction_monitoring",
+        "category": "aml",
+        "description": "Detect rapid succession of transactions indicating possible structuring",
+        "business_justification": "High frequency transactions may indicate structuring to avoid reporting",
+        "regulatory_reference": "CBN AML/CFT Guidelines Section 3.1",
+        "conditions": {"velocity_check": True, "structuring_detection": True},
+        "thresholds": {"transaction_count_24h": 20, "amount_24h": 10000000},
+        "risk_weight": 1.2,
+        "severity_level": "medium",
+        "alert_priority": 3
+    },
+    {
+        "rule_name": "Cross-Border High Risk Country",
+        "rule_code": "CBN-CB-001",
+        "rule_type": "transaction_monitoring",
+        "category": "aml",
+        "description": "Monitor transactions to/from high-risk countries",
+        "business_justification": "Transactions with high-risk jurisdictions require enhanced monitoring",
+        "regulatory_reference": "CBN AML/CFT Guidelines Section 5.3",
+        "conditions": {"cross_border": True, "high_risk_country": True},
+        "thresholds": {"amount": 1000000},
+        "risk_weight": 2.0,
+        "severity_level": "high",
+        "alert_priority": 1
+    },
+    {
+        "rule_name": "PEP Transaction Monitoring",
+        "rule_code": "CBN-PEP-001",
+        "rule_type": "transaction_monitoring",
+        "category": "aml",
+        "description": "Enhanced monitoring of Politically Exposed Persons",
+        "business_justification": "PEPs require enhanced due diligence and monitoring",
+        "regulatory_reference": "CBN AML/CFT Guidelines Section 6.1",
+        "conditions": {"customer_risk": True, "pep_monitoring": True},
+        "thresholds": {"amount": 500000},
+        "applies_to": "individuals",
+        "risk_weight": 1.8,
+        "severity_level": "high",
+        "alert_priority": 2
+    })
+
 @authenticated
 def create_standard_cbn_rules(user: User) -> List[Rule]:
-    \"\"\"Create standard CBN-compliant AML rules.\"\"\"
-    
-    standard_rules = [
-        {
-            "rule_name": "High Value Cash Transaction",
-            "rule_code": "CBN-CASH-001",
-            "rule_type": "transaction_monitoring",
-            "category": "aml",
-            "description": "Monitor cash transactions above CBN reporting threshold",
-            "business_justification": "CBN requires reporting of cash transactions above 5M NGN",
-            "regulatory_reference": "CBN AML/CFT Guidelines Section 4.2",
-            "conditions": {"amount_threshold": True, "cash_monitoring": True},
-            "thresholds": {"amount": 5000000, "cash_amount": 5000000},
-            "transaction_types": ["deposit", "withdrawal"],
-            "risk_weight": 1.5,
-            "severity_level": "high",
-            "alert_priority": 2
-        },
-        {
-            "rule_name": "Rapid Transaction Velocity",
-            "rule_code": "CBN-VEL-001",
-            "rule_type": "transaction_monitoring",
-            "category": "aml",
-            "description": "Detect rapid succession of transactions indicating possible structuring",
-            "business_justification": "High frequency transactions may indicate structuring to avoid reporting",
-            "regulatory_reference": "CBN AML/CFT Guidelines Section 3.1",
-            "conditions": {"velocity_check": True, "structuring_detection": True},
-            "thresholds": {"transaction_count_24h": 20, "amount_24h": 10000000},
-            "risk_weight": 1.2,
-            "severity_level": "medium",
-            "alert_priority": 3
-        },
-        {
-            "rule_name": "Cross-Border High Risk Country",
-            "rule_code": "CBN-CB-001",
-            "rule_type": "transaction_monitoring",
-            "category": "aml",
-            "description": "Monitor transactions to/from high-risk countries",
-            "business_justification": "Transactions with high-risk jurisdictions require enhanced monitoring",
-            "regulatory_reference": "CBN AML/CFT Guidelines Section 5.3",
-            "conditions": {"cross_border": True, "high_risk_country": True},
-            "thresholds": {"amount": 1000000},
-            "risk_weight": 2.0,
-            "severity_level": "high",
-            "alert_priority": 1
-        },
-        {
-            "rule_name": "PEP Transaction Monitoring",
-            "rule_code": "CBN-PEP-001",
-            "rule_type": "transaction_monitoring",
-            "category": "aml",
-            "description": "Enhanced monitoring of Politically Exposed Persons",
-            "business_justification": "PEPs require enhanced due diligence and monitoring",
-            "regulatory_reference": "CBN AML/CFT Guidelines Section 6.1",
-            "conditions": {"customer_risk": True, "pep_monitoring": True},
-            "thresholds": {"amount": 500000},
-            "applies_to": "individuals",
-            "risk_weight": 1.8,
-            "severity_level": "high",
-            "alert_priority": 2
-        }
+    """Create standard CBN-compliant AML rules."""
+    
+    # One multi-row INSERT for all standard rules; codes that already
+    # exist are skipped via ON CONFLICT (rule_code) DO NOTHING (unique
+    # index idx_rules_rule_code), so no per-rule uniqueness SELECT. The
+    # per-rule audit entries go out as one multi-row insert as well —
+    # two round trips instead of three per rule.
+    candidate_rules = [
+        Rule(
+            rule_name=rule_data["rule_name"],
+            rule_code=rule_data["rule_code"],
+            rule_type=rule_data["rule_type"],
+            category=rule_data["category"],
+            description=rule_data["description"],
+            business_justification=rule_data["business_justification"],
+            regulatory_reference=rule_data["regulatory_reference"],
+            conditions=rule_data["conditions"],
+            thresholds=rule_data["thresholds"],
+            applies_to=rule_data.get("applies_to", "all"),
+            customer_segments=[],
+            transaction_types=rule_data.get("transaction_types", []),
+            channels=[],
+            risk_weight=rule_data["risk_weight"],
+            severity_level=rule_data["severity_level"],
+            alert_priority=rule_data["alert_priority"],
+            status="draft",
+            created_by=user.id
+        )
+        for rule_data in _STANDARD_CBN_RULES
     ]
-    
-    created_rules = []
-    
-    for rule_data in standard_rules:
-        try:
-            rule = create_aml_rule(
-                user=user,
-                rule_name=rule_data["rule_name"],
-                rule_code=rule_data["rule_code"],
-                rule_type=rule_data["rule_type"],
-                category=rule_data["category"],
-                description=rule_data["description"],
-                business_justification=rule_data["business_justification"],
-                conditions=rule_data["conditions"],
-                thresholds=rule_data["thresholds"],
-                applies_to=rule_data.get("applies_to", "all"),
-                transaction_types=rule_data.get("transaction_types", []),
-                risk_weight=rule_data["risk_weight"],
-                severity_level=rule_data["severity_level"],
-                alert_priority=rule_data["alert_priority"],
-                regulatory_reference=rule_data["regulatory_reference"]
+
+    created_rows = Rule.sync_many(candidate_rules, on_conflict="rule_code", returning=["*"])
+    created_rules = [Rule.construct_fast(row) for row in created_rows]
+
+    if created_rules:
+        AuditLog.sync_many([
+            AuditLog(
+                event_id=str(uuid.uuid4()),
+                event_type="rule_created",
+                event_category="rules_management",
+                user_id=user.id,
+                action="create",
+                resource_type="rule",
+                resource_id=rule.id,
+                description=f"AML rule {rule.rule_name} ({rule.rule_code}) created",
+                details={"rule_type": rule.rule_type, "category": rule.category},
+                regulatory_significance=True
             )
-            created_rules.append(rule)
-        except ValueError as e:
-            # Rule might already exist, continue with others
-            continue
-    
+            for rule in created_rules
+        ])
+
+
     # Log standard rules creation
     log_audit_event(
         user_id=user.id,
@@ -572,13 +659,55 @@ def create_standard_cbn_rules(user: User) -> List[Rule]:
     
     return created_rules
 
-def increment_version(current_version: str) -> str:
-    \"\"\"Increment rule version number.\"\"\"
-    try:
-        major, minor = current_version.split(".")
-        return f"{major}.{int(minor) + 1}"
-    except:
-        return "1.1"
+def rule_to_sql_predicate(rule: Rule) -> Tuple[str, Dict[str, Any]]:
+    """Translate a rule's conditions and thresholds into a SQL boolean
+    fragment over the back-test sample columns.
+
+    Mirrors apply_monitoring_rule: the rule triggers when any configured
+    condition matches. Fragments referencing the 24h window aggregates
+    (txn_count_24h, near_ctr_count_24h, ...) rely on the caller exposing
+    those columns in the sample.
+    """
+
+    conditions = rule.conditions
+    thresholds = rule.thresholds
+
+    clauses = []
+    params: Dict[str, Any] = {}
+
+    if "amount_threshold" in conditions:
+        clauses.append("amount >= %(rule_amount)s")
+        params["rule_amount"] = thresholds.get("amount", 1000000)
+
+    if "velocity_check" in conditions:
+        clauses.append(
+            "(txn_count_24h >= %(rule_count_24h)s OR amount_24h >= %(rule_amount_24h)s)"
+        )
+        params["rule_count_24h"] = thresholds.get("transaction_count_24h", 50)
+        params["rule_amount_24h"] = thresholds.get("amount_24h", 10000000)
+
+    if "structuring_detection" in conditions:
+        clauses.append(
+            "(near_ctr_count_24h >= 3 AND near_ctr_amount_24h > %(ctr_threshold)s)"
+        )
+        params["ctr_threshold"] = CTR_THRESHOLD_NGN
+        params["ctr_low"] = CTR_THRESHOLD_NGN * 0.8
+        params["ctr_high"] = CTR_THRESHOLD_NGN * 0.99
+
+    if "cross_border" in conditions:
+        clauses.append("cross_border")
+
+    if "cash_monitoring" in conditions:
+        clauses.append("(cash_transaction AND amount >= %(rule_cash_amount)s)")
+        params["rule_cash_amount"] = thresholds.get("cash_amount", 500000)
+
+    if "customer_risk" in conditions:
+        clauses.append("(risk_category = 'high' OR pep_status)")
+
+    if not clauses:
+        return "false", params
+
+    return " OR ".join(clauses), params
 
 def log_audit_event(
     user_id: uuid.UUID,
@@ -592,7 +721,7 @@ def log_audit_event(
     new_values: Optional[Dict] = None,
     records_affected: Optional[int] = None
 ):
-    \"\"\"Log an audit event for compliance tracking.\"\"\"
+    """Log an audit event for compliance tracking."""
     
     audit_log = AuditLog(
         event_id=str(uuid.uuid4()),
@@ -609,5 +738,5 @@ def log_audit_event(
         records_affected=records_affected,
         regulatory_significance=True
     )
-    
-    audit_log.sync()
\ No newline at end of file
+
+    audit_writer.enqueue(audit_log)
\ No newline at end of file
@@ -1,4 +1,5 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Tuple
+from collections import namedtuple
 from datetime import datetime, timedelta
 import uuid
 import json
@@ -8,8 +9,49 @@ from core.customer import Customer
 from core.alert import Alert
 from core.rule import Rule
 from core.audit_log import AuditLog
+from core.cache import TTLCache
+from core import audit_writer
+from solar import run_parallel
 from solar.access import User, authenticated, public
 
+# The monitoring path needs the active rule set for every transaction,
+# but rules change on the order of minutes. Cache the hydrated list for
+# a short TTL; the rules-engine mutators bust it explicitly and the TTL
+# bounds staleness for writes from other processes.
+_monitoring_rules_cache = TTLCache(maxsize=1, ttl=30.0)
+_MONITORING_RULES_KEY = "transaction_monitoring"
+
+# FATF high-risk jurisdictions for cross-border scoring. A frozenset
+# gives an O(1) hash lookup with no per-call allocation, and stays that
+# way as the list grows with FATF updates.
+HIGH_RISK_COUNTRIES = frozenset({"AF", "IR", "KP", "SY"})
+
+# Monitoring only reads these customer fields (the compiled evaluators
+# check risk_category/pep_status; the SQL fallbacks key on id), so the
+# context queries project them instead of shipping and validating the
+# full customer row per transaction.
+CustomerView = namedtuple("CustomerView", ["id", "risk_category", "pep_status"])
+
+def _get_active_monitoring_rules() -> List[Rule]:
+    rules = _monitoring_rules_cache.get(_MONITORING_RULES_KEY)
+    if rules is None:
+        # Project the columns the evaluators read (plus the cache key
+        # fields) rather than dragging every rule column over the wire
+        rows = Rule.sql(
+            """SELECT id, version, rule_code, rule_name, severity_level,
+                      risk_weight, conditions, thresholds
+               FROM rules
+               WHERE status = 'active' AND rule_type = 'transaction_monitoring'""",
+            prepare=True
+        )
+        rules = [Rule.construct_fast(row) for row in rows]
+        _monitoring_rules_cache.set(_MONITORING_RULES_KEY, rules)
+    return rules
+
+def invalidate_rule_cache():
+    """Drop the cached active rule set after a rule mutation."""
+    _monitoring_rules_cache.clear()
+
 @authenticated
 def process_transaction(
     user: User,
@@ -30,12 +72,18 @@ def process_transaction(
     ip_address: Optional[str] = None,
     device_id: Optional[str] = None
 ) -> Transaction:
-    \"\"\"Process a new transaction and perform AML monitoring.\"\"\"
-    
+    """Process a new transaction and perform AML monitoring."""
+
+    # Snapshot the clock once: every timestamp derived below (reference
+    # number, transaction/value dates, monitoring windows, alert and audit
+    # records) agrees to the microsecond.
+    now = datetime.now()
+    date_tag = now.strftime('%Y%m%d')
+
     # Create transaction record
     transaction = Transaction(
         transaction_id=transaction_id,
-        reference_number=f"REF-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8]}",
+        reference_number=f"REF-{date_tag}-{uuid.uuid4().hex[:8]}",
         customer_id=customer_id,
         transaction_type=transaction_type,
         transaction_method=transaction_method,
@@ -51,8 +99,8 @@ def process_transaction(
         location=location,
         ip_address=ip_address,
         device_id=device_id,
-        transaction_date=datetime.now(),
-        value_date=datetime.now(),
+        transaction_date=now,
+        value_date=now,
         status="completed",
         cross_border=beneficiary_country is not None and beneficiary_country != "NG",
         cash_transaction=transaction_method.lower() in ["cash", "atm_withdrawal"],
@@ -60,28 +108,44 @@ def process_transaction(
     )
     
     # Perform real-time AML monitoring
-    monitoring_results = perform_aml_monitoring(transaction)
-    
-    # Update transaction with monitoring results
-    transaction.risk_score = monitoring_results["risk_score"]
-    transaction.risk_flags = monitoring_results["risk_flags"]
-    transaction.is_suspicious = monitoring_results["is_suspicious"]
-    transaction.alert_count = len(monitoring_results["alerts_generated"])
-    
-    # Set specific flags based on monitoring
-    transaction.structuring_indicator = monitoring_results["risk_flags"].get("structuring", False)
-    transaction.velocity_flag = monitoring_results["risk_flags"].get("velocity", False)
-    transaction.amount_threshold_flag = monitoring_results["risk_flags"].get("amount_threshold", False)
-    transaction.unusual_pattern_flag = monitoring_results["risk_flags"].get("unusual_pattern", False)
-    
+    monitoring_results = perform_aml_monitoring(transaction, now=now)
+    
+    # Update transaction with monitoring results, including the specific
+    # per-pattern flags — one batched attribute update instead of eight
+    # validated __setattr__ dispatches
+    risk_flags = monitoring_results["risk_flags"]
+    transaction.update_fields(
+        risk_score=monitoring_results["risk_score"],
+        risk_flags=risk_flags,
+        is_suspicious=monitoring_results["is_suspicious"],
+        alert_count=len(monitoring_results["alerts_generated"]),
+        structuring_indicator=risk_flags.get("structuring", False),
+        velocity_flag=risk_flags.get("velocity", False),
+        amount_threshold_flag=risk_flags.get("amount_threshold", False),
+        unusual_pattern_flag=risk_flags.get("unusual_pattern", False),
+    )
+
     transaction.sync()
-    
-    # Generate alerts if necessary
+
+    # Generate alerts if necessary, accumulating the alert rows so
+    # persistence is one multi-row statement; audit events go to the
+    # background writer, which batches them off the serving path.
+    pending_alerts = []
     for alert_data in monitoring_results["alerts_generated"]:
-        create_alert_from_transaction(user, transaction, alert_data)
-    
+        alert = build_alert_from_transaction(transaction, alert_data, date_tag)
+        pending_alerts.append(alert)
+        audit_writer.enqueue(build_audit_event(
+            user_id=user.id,
+            event_type="alert_generated",
+            action="create",
+            resource_type="alert",
+            resource_id=alert.id,
+            description=f"Alert generated for transaction {transaction.transaction_id}",
+            details=alert_data
+        ))
+
     # Log transaction processing
-    log_audit_event(
+    audit_writer.enqueue(build_audit_event(
         user_id=user.id,
         event_type="transaction_processed",
         action="create",
@@ -89,44 +153,149 @@ def process_transaction(
         resource_id=transaction.id,
         description=f"Transaction {transaction.transaction_id} processed for amount {amount} {currency}",
         details=monitoring_results
-    )
-    
+    ))
+
+    if pending_alerts:
+        Alert.sync_many(pending_alerts)
+
     return transaction
 
 @authenticated
-def perform_aml_monitoring(transaction: Transaction) -> Dict[str, Any]:
-    \"\"\"Perform comprehensive AML monitoring on a transaction.\"\"\"
-    
+def process_transaction_batch(user: User, transactions: List[Dict[str, Any]]) -> List[Transaction]:
+    """Process a batch of transactions and perform AML monitoring on each.
+
+    Same semantics as calling process_transaction per payload, but the
+    monitoring contexts are prefetched with one grouped statement and the
+    transaction, alert and audit rows are written in multi-row batches,
+    so the round-trip count stays flat as the batch grows."""
+
+    if not transactions:
+        return []
+
+    now = datetime.now()
+    date_tag = now.strftime('%Y%m%d')
+
+    txns = []
+    for payload in transactions:
+        transaction_method = payload.get("transaction_method", "mobile")
+        beneficiary_country = payload.get("beneficiary_country")
+        txns.append(Transaction(
+            transaction_id=payload["transaction_id"],
+            reference_number=f"REF-{date_tag}-{uuid.uuid4().hex[:8]}",
+            customer_id=payload["customer_id"],
+            transaction_type=payload["transaction_type"],
+            transaction_method=transaction_method,
+            currency=payload["currency"],
+            amount=payload["amount"],
+            account_number=payload["account_number"],
+            beneficiary_name=payload.get("beneficiary_name"),
+            beneficiary_account=payload.get("beneficiary_account"),
+            beneficiary_bank=payload.get("beneficiary_bank"),
+            beneficiary_country=beneficiary_country,
+            description=payload["description"],
+            channel=payload.get("channel", "mobile_app"),
+            location=payload.get("location"),
+            ip_address=payload.get("ip_address"),
+            device_id=payload.get("device_id"),
+            transaction_date=now,
+            value_date=now,
+            status="completed",
+            cross_border=beneficiary_country is not None and beneficiary_country != "NG",
+            cash_transaction=transaction_method.lower() in ["cash", "atm_withdrawal"],
+            above_ctr_threshold=payload["amount"] >= 5000000  # 5M NGN CTR threshold
+        ))
+
+    contexts, rules = run_parallel(
+        lambda: fetch_monitoring_context_batch([txn.customer_id for txn in txns], now=now),
+        _get_active_monitoring_rules,
+    )
+
+    alerts = []
+    for transaction in txns:
+        context = contexts[transaction.customer_id]
+        monitoring_results = _evaluate_transaction(transaction, context["customer"], rules, context, now=now)
+
+        risk_flags = monitoring_results["risk_flags"]
+        transaction.update_fields(
+            risk_score=monitoring_results["risk_score"],
+            risk_flags=risk_flags,
+            is_suspicious=monitoring_results["is_suspicious"],
+            alert_count=len(monitoring_results["alerts_generated"]),
+            structuring_indicator=risk_flags.get("structuring", False),
+            velocity_flag=risk_flags.get("velocity", False),
+            amount_threshold_flag=risk_flags.get("amount_threshold", False),
+            unusual_pattern_flag=risk_flags.get("unusual_pattern", False),
+        )
+
+        for alert_data in monitoring_results["alerts_generated"]:
+            alert = build_alert_from_transaction(transaction, alert_data, date_tag)
+            alerts.append(alert)
+            audit_writer.enqueue(build_audit_event(
+                user_id=user.id,
+                event_type="alert_generated",
+                action="create",
+                resource_type="alert",
+                resource_id=alert.id,
+                description=f"Alert generated for transaction {transaction.transaction_id}",
+                details=alert_data
+            ))
+
+        audit_writer.enqueue(build_audit_event(
+            user_id=user.id,
+            event_type="transaction_processed",
+            action="create",
+            resource_type="transaction",
+            resource_id=transaction.id,
+            description=f"Transaction {transaction.transaction_id} processed for amount {transaction.amount} {transaction.currency}",
+            details=monitoring_results
+        ))
+
+    Transaction.sync_many(txns)
+    if alerts:
+        Alert.sync_many(alerts)
+
+    return txns
+
+@authenticated
+def perform_aml_monitoring(transaction: Transaction, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Perform comprehensive AML monitoring on a transaction.
+
+    Callers that already hold a clock snapshot pass it as `now` so window
+    boundaries and the monitoring timestamp line up with the transaction's
+    own dates."""
+
+    if now is None:
+        now = datetime.now()
+
+    # The context prefetch (customer row, 24h velocity, near-CTR window,
+    # 30-day average in one statement) and the rule-set fetch are
+    # independent — overlap their round trips. Rule evaluation itself
+    # stays serial: with the prefetched context the compiled evaluators
+    # are pure Python, so farming them out to threads would only add
+    # dispatch overhead.
+    context, rules = run_parallel(
+        lambda: fetch_monitoring_context(transaction, now=now),
+        _get_active_monitoring_rules,
+    )
+
+    return _evaluate_transaction(transaction, context["customer"], rules, context, now=now)
+
+def _evaluate_transaction(transaction: Transaction, customer: Customer, rules: List[Rule], context: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Run the active rules and pattern checks for one transaction against
+    its prefetched context. Pure in-memory work — no SQL."""
+
     risk_score = 0.0
     risk_flags = {}
     alerts_generated = []
-    
-    # Get customer information
-    customer_results = Customer.sql(
-        "SELECT * FROM customers WHERE id = %(customer_id)s",
-        {"customer_id": transaction.customer_id}
-    )
-    
-    if not customer_results:
-        raise ValueError("Customer not found")
-    
-    customer = Customer(**customer_results[0])
-    
-    # Get active monitoring rules
-    active_rules = Rule.sql(
-        "SELECT * FROM rules WHERE status = 'active' AND rule_type = 'transaction_monitoring'"
-    )
-    
-    rules = [Rule(**rule) for rule in active_rules]
-    
+
     # Apply each rule
     for rule in rules:
-        rule_result = apply_monitoring_rule(transaction, customer, rule)
-        
+        rule_result = apply_monitoring_rule(transaction, customer, rule, context)
+
         if rule_result["triggered"]:
             risk_score += rule_result["risk_contribution"]
             risk_flags[rule.rule_code.lower()] = True
-            
+
             # Generate alert if rule threshold exceeded
             if rule_result["alert_required"]:
                 alerts_generated.append({
@@ -136,121 +305,308 @@ def perform_aml_monitoring(transaction: Transaction) -> Dict[str, Any]:
                     "threshold_exceeded": rule_result["threshold_values"],
                     "severity": rule.severity_level
                 })
-    
+
     # Additional pattern analysis
-    pattern_results = detect_transaction_patterns(transaction, customer)
+    pattern_results = detect_transaction_patterns(transaction, customer, context)
     risk_score += pattern_results["risk_contribution"]
     risk_flags.update(pattern_results["flags"])
-    
+
     if pattern_results["alerts"]:
         alerts_generated.extend(pattern_results["alerts"])
-    
+
     # Normalize risk score
     risk_score = min(100.0, max(0.0, risk_score))
-    
+
     return {
         "risk_score": risk_score,
         "risk_flags": risk_flags,
         "is_suspicious": risk_score >= 60.0,
         "alerts_generated": alerts_generated,
-        "rules_triggered": len([flag for flag in risk_flags.values() if flag]),
-        "monitoring_timestamp": datetime.now().isoformat()
+        # Flags are only ever set True, so the dict size is the count
+        "rules_triggered": len(risk_flags),
+        "monitoring_timestamp": (now or datetime.now()).isoformat()
     }
 
-def apply_monitoring_rule(transaction: Transaction, customer: Customer, rule: Rule) -> Dict[str, Any]:
-    \"\"\"Apply a specific monitoring rule to a transaction.\"\"\"
-    
-    result = {
-        "triggered": False,
-        "risk_contribution": 0.0,
-        "alert_required": False,
-        "threshold_values": {}
+# One statement for everything per-transaction monitoring reads: the
+# customer row plus the per-customer aggregates the velocity, structuring
+# and frequency checks previously fetched with a round trip each.
+MONITORING_CONTEXT_SQL = """
+    WITH velocity AS (
+        SELECT COUNT(*) AS count, COALESCE(SUM(amount), 0) AS total_amount
+        FROM transactions
+        WHERE customer_id = %(customer_id)s
+        AND transaction_date >= %(velocity_start)s
+    ),
+    struct AS (
+        SELECT COUNT(*) AS count, COALESCE(SUM(amount), 0) AS total_amount
+        FROM transactions
+        WHERE customer_id = %(customer_id)s
+        AND transaction_date >= %(structuring_start)s
+        AND amount BETWEEN %(near_ctr_low)s AND %(near_ctr_high)s
+    ),
+    avg30 AS (
+        SELECT AVG(amount) AS avg_amount, COUNT(*) AS transaction_count
+        FROM transactions
+        WHERE customer_id = %(customer_id)s
+        AND transaction_date >= %(avg_start)s
+    )
+    SELECT c.id AS customer_id, c.risk_category, c.pep_status,
+           v.count AS velocity_count, v.total_amount AS velocity_total,
+           s.count AS structuring_count, s.total_amount AS structuring_total,
+           a.avg_amount AS avg_amount_30d, a.transaction_count AS transaction_count_30d
+    FROM customers c
+    CROSS JOIN velocity v
+    CROSS JOIN struct s
+    CROSS JOIN avg30 a
+    WHERE c.id = %(customer_id)s
+"""
+
+def fetch_monitoring_context(transaction: Transaction, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Prefetch the monitoring context for a transaction in one round trip.
+
+    The helpers below accept this context so per-transaction monitoring
+    issues a single statement instead of one query per check."""
+
+    if now is None:
+        now = datetime.now()
+    rows = Transaction.sql(
+        MONITORING_CONTEXT_SQL,
+        {
+            "customer_id": transaction.customer_id,
+            "velocity_start": now - timedelta(hours=24),
+            "structuring_start": now - timedelta(days=1),
+            "near_ctr_low": 5000000 * 0.8,
+            "near_ctr_high": 5000000 * 0.99,
+            "avg_start": now - timedelta(days=30),
+        },
+        prepare=True
+    )
+
+    if not rows:
+        raise ValueError("Customer not found")
+
+    row = rows[0]
+    return {
+        "customer": CustomerView(row["customer_id"], row["risk_category"], row["pep_status"]),
+        "velocity": {"count": row["velocity_count"], "total_amount": row["velocity_total"]},
+        "structuring": {"count": row["structuring_count"], "total_amount": row["structuring_total"]},
+        "avg_30d": {"avg_amount": row["avg_amount_30d"], "transaction_count": row["transaction_count_30d"]},
     }
-    
+
+# Batch variant: grouped aggregates over one scan of the customers'
+# recent transactions, one output row per customer.
+MONITORING_CONTEXT_BATCH_SQL = """
+    WITH agg AS (
+        SELECT customer_id,
+               COUNT(*) FILTER (WHERE transaction_date >= %(velocity_start)s) AS velocity_count,
+               COALESCE(SUM(amount) FILTER (WHERE transaction_date >= %(velocity_start)s), 0) AS velocity_total,
+               COUNT(*) FILTER (WHERE transaction_date >= %(structuring_start)s
+                                AND amount BETWEEN %(near_ctr_low)s AND %(near_ctr_high)s) AS structuring_count,
+               COALESCE(SUM(amount) FILTER (WHERE transaction_date >= %(structuring_start)s
+                                            AND amount BETWEEN %(near_ctr_low)s AND %(near_ctr_high)s), 0) AS structuring_total,
+               AVG(amount) AS avg_amount_30d,
+               COUNT(*) AS transaction_count_30d
+        FROM transactions
+        WHERE customer_id = ANY(%(customer_ids)s)
+        AND transaction_date >= %(avg_start)s
+        GROUP BY customer_id
+    )
+    SELECT c.id AS customer_id, c.risk_category, c.pep_status,
+           COALESCE(a.velocity_count, 0) AS velocity_count,
+           COALESCE(a.velocity_total, 0) AS velocity_total,
+           COALESCE(a.structuring_count, 0) AS structuring_count,
+           COALESCE(a.structuring_total, 0) AS structuring_total,
+           a.avg_amount_30d AS avg_amount_30d,
+           COALESCE(a.transaction_count_30d, 0) AS transaction_count_30d
+    FROM customers c
+    LEFT JOIN agg a ON a.customer_id = c.id
+    WHERE c.id = ANY(%(customer_ids)s)
+"""
+
+def fetch_monitoring_context_batch(customer_ids: List[uuid.UUID], now: Optional[datetime] = None) -> Dict[uuid.UUID, Dict[str, Any]]:
+    """Prefetch monitoring contexts for every distinct customer in a batch
+    with a single grouped statement. Raises ValueError when any customer
+    is missing."""
+
+    distinct_ids = list(set(customer_ids))
+    if now is None:
+        now = datetime.now()
+    rows = Transaction.sql(
+        MONITORING_CONTEXT_BATCH_SQL,
+        {
+            "customer_ids": distinct_ids,
+            "velocity_start": now - timedelta(hours=24),
+            "structuring_start": now - timedelta(days=1),
+            "near_ctr_low": 5000000 * 0.8,
+            "near_ctr_high": 5000000 * 0.99,
+            "avg_start": now - timedelta(days=30),
+        },
+        prepare=True
+    )
+
+    contexts = {}
+    for row in rows:
+        contexts[row["customer_id"]] = {
+            "customer": CustomerView(row["customer_id"], row["risk_category"], row["pep_status"]),
+            "velocity": {"count": row["velocity_count"], "total_amount": row["velocity_total"]},
+            "structuring": {"count": row["structuring_count"], "total_amount": row["structuring_total"]},
+            "avg_30d": {"avg_amount": row["avg_amount_30d"], "transaction_count": row["transaction_count_30d"]},
+        }
+
+    missing = [str(cid) for cid in distinct_ids if cid not in contexts]
+    if missing:
+        raise ValueError(f"Customers not found: {', '.join(missing)}")
+
+    return contexts
+
+def apply_monitoring_rule(transaction: Transaction, customer: Customer, rule: Rule, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Apply a specific monitoring rule to a transaction."""
+
+    return compile_rule_evaluator(rule)(transaction, customer, context)
+
+# Evaluators specialized per rule, keyed on (id, version) — version bumps
+# whenever thresholds change, so stale entries age out naturally.
+_rule_evaluator_cache: Dict[Tuple[uuid.UUID, str], Callable[[Transaction, Customer], Dict[str, Any]]] = {}
+
+def compile_rule_evaluator(rule: Rule) -> Callable[[Transaction, Customer], Dict[str, Any]]:
+    """Return a per-rule evaluator specialized at first use.
+
+    The generic path re-inspected rule.conditions/rule.thresholds on every
+    transaction. Instead, generate a function containing only the branches
+    this rule actually configures, with thresholds and risk-weight products
+    inlined as constants, and cache it for the rule's lifetime.
+    """
+
+    key = (rule.id, rule.version)
+    evaluate = _rule_evaluator_cache.get(key)
+    if evaluate is None:
+        evaluate = _generate_rule_evaluator(rule)
+        if len(_rule_evaluator_cache) >= 1024:
+            _rule_evaluator_cache.clear()
+        _rule_evaluator_cache[key] = evaluate
+    return evaluate
+
+def _generate_rule_evaluator(rule: Rule) -> Callable[[Transaction, Customer], Dict[str, Any]]:
+    """Generate the specialized evaluator source for a rule and exec it."""
+
     conditions = rule.conditions
     thresholds = rule.thresholds
-    
+
+    lines = [
+        "def evaluate(transaction, customer, context=None):",
+        "    result = {",
+        '        "triggered": False,',
+        '        "risk_contribution": 0.0,',
+        '        "alert_required": False,',
+        '        "threshold_values": {}',
+        "    }",
+    ]
+
     # Amount-based rules
     if "amount_threshold" in conditions:
         threshold = thresholds.get("amount", 1000000)  # Default 1M NGN
-        if transaction.amount >= threshold:
-            result["triggered"] = True
-            result["risk_contribution"] = rule.risk_weight * 20.0
-            result["alert_required"] = True
-            result["threshold_values"]["amount"] = {
-                "actual": transaction.amount,
-                "threshold": threshold
-            }
-    
+        lines += [
+            f"    if transaction.amount >= {threshold!r}:",
+            '        result["triggered"] = True',
+            f'        result["risk_contribution"] = {rule.risk_weight * 20.0!r}',
+            '        result["alert_required"] = True',
+            '        result["threshold_values"]["amount"] = {',
+            '            "actual": transaction.amount,',
+            f'            "threshold": {threshold!r}',
+            "        }",
+        ]
+
     # Velocity rules (transaction frequency)
     if "velocity_check" in conditions:
-        velocity_result = check_transaction_velocity(transaction, customer)
-        if velocity_result["threshold_exceeded"]:
-            result["triggered"] = True
-            result["risk_contribution"] = rule.risk_weight * 15.0
-            result["alert_required"] = True
-            result["threshold_values"]["velocity"] = velocity_result
-    
+        lines += [
+            "    velocity_result = check_transaction_velocity(transaction, customer, context)",
+            '    if velocity_result["threshold_exceeded"]:',
+            '        result["triggered"] = True',
+            f'        result["risk_contribution"] = {rule.risk_weight * 15.0!r}',
+            '        result["alert_required"] = True',
+            '        result["threshold_values"]["velocity"] = velocity_result',
+        ]
+
     # Structuring detection
     if "structuring_detection" in conditions:
-        structuring_result = detect_structuring(transaction, customer)
-        if structuring_result["likely_structuring"]:
-            result["triggered"] = True
-            result["risk_contribution"] = rule.risk_weight * 25.0
-            result["alert_required"] = True
-            result["threshold_values"]["structuring"] = structuring_result
-    
-    # Cross-border rules
-    if "cross_border" in conditions and transaction.cross_border:
-        result["triggered"] = True
-        result["risk_contribution"] = rule.risk_weight * 10.0
-        
-        # High-risk countries get additional score
-        if transaction.beneficiary_country in ["AF", "IR", "KP", "SY"]:
-            result["risk_contribution"] += rule.risk_weight * 20.0
-            result["alert_required"] = True
-    
+        lines += [
+            "    structuring_result = detect_structuring(transaction, customer, context)",
+            '    if structuring_result["likely_structuring"]:',
+            '        result["triggered"] = True',
+            f'        result["risk_contribution"] = {rule.risk_weight * 25.0!r}',
+            '        result["alert_required"] = True',
+            '        result["threshold_values"]["structuring"] = structuring_result',
+        ]
+
+    # Cross-border rules; high-risk countries get additional score
+    if "cross_border" in conditions:
+        lines += [
+            "    if transaction.cross_border:",
+            '        result["triggered"] = True',
+            f'        result["risk_contribution"] = {rule.risk_weight * 10.0!r}',
+            "        if transaction.beneficiary_country in HIGH_RISK_COUNTRIES:",
+            f'            result["risk_contribution"] += {rule.risk_weight * 20.0!r}',
+            '            result["alert_required"] = True',
+        ]
+
     # Cash transaction rules
-    if "cash_monitoring" in conditions and transaction.cash_transaction:
+    if "cash_monitoring" in conditions:
         cash_threshold = thresholds.get("cash_amount", 500000)  # 500K NGN
-        if transaction.amount >= cash_threshold:
-            result["triggered"] = True
-            result["risk_contribution"] = rule.risk_weight * 15.0
-            result["alert_required"] = True
-    
+        lines += [
+            f"    if transaction.cash_transaction and transaction.amount >= {cash_threshold!r}:",
+            '        result["triggered"] = True',
+            f'        result["risk_contribution"] = {rule.risk_weight * 15.0!r}',
+            '        result["alert_required"] = True',
+        ]
+
     # Customer risk-based rules
     if "customer_risk" in conditions:
-        if customer.risk_category == "high":
-            result["triggered"] = True
-            result["risk_contribution"] = rule.risk_weight * 10.0
-        elif customer.pep_status:
-            result["triggered"] = True
-            result["risk_contribution"] = rule.risk_weight * 15.0
-            result["alert_required"] = True
-    
-    return result
+        lines += [
+            '    if customer.risk_category == "high":',
+            '        result["triggered"] = True',
+            f'        result["risk_contribution"] = {rule.risk_weight * 10.0!r}',
+            "    elif customer.pep_status:",
+            '        result["triggered"] = True',
+            f'        result["risk_contribution"] = {rule.risk_weight * 15.0!r}',
+            '        result["alert_required"] = True',
+        ]
+
+    lines.append("    return result")
+
+    namespace = {
+        "check_transaction_velocity": check_transaction_velocity,
+        "detect_structuring": detect_structuring,
+        "HIGH_RISK_COUNTRIES": HIGH_RISK_COUNTRIES,
+    }
+    exec(compile("\n".join(lines), f"<rule {rule.rule_code}>", "exec"), namespace)
+    return namespace["evaluate"]
+
+def check_transaction_velocity(transaction: Transaction, customer: Customer, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Check transaction velocity for potential suspicious activity."""
+
+    if context is not None:
+        count = context["velocity"]["count"]
+        total_amount = context["velocity"]["total_amount"] or 0
+    else:
+        # No prefetched context — get transactions in last 24 hours
+        recent_transactions = Transaction.sql(
+            """SELECT COUNT(*) as count, SUM(amount) as total_amount
+               FROM transactions
+               WHERE customer_id = %(customer_id)s
+               AND transaction_date >= %(start_time)s""",
+            {
+                "customer_id": customer.id,
+                "start_time": datetime.now() - timedelta(hours=24)
+            },
+            prepare=True
+        )
+
+        if not recent_transactions:
+            return {"threshold_exceeded": False}
+
+        count = recent_transactions[0]["count"]
+        total_amount = recent_transactions[0]["total_amount"] or 0
 
-def check_transaction_velocity(transaction: Transaction, customer: Customer) -> Dict[str, Any]:
-    \"\"\"Check transaction velocity for potential suspicious activity.\"\"\"
-    
-    # Get transactions in last 24 hours
-    recent_transactions = Transaction.sql(
-        \"\"\"SELECT COUNT(*) as count, SUM(amount) as total_amount
-           FROM transactions 
-           WHERE customer_id = %(customer_id)s 
-           AND transaction_date >= %(start_time)s\"\"\",
-        {
-            "customer_id": customer.id,
-            "start_time": datetime.now() - timedelta(hours=24)
-        }
-    )
-    
-    if not recent_transactions:
-        return {"threshold_exceeded": False}
-    
-    count = recent_transactions[0]["count"]
-    total_amount = recent_transactions[0]["total_amount"] or 0
-    
     # Velocity thresholds
     count_threshold = 50  # 50 transactions per day
     amount_threshold = 10000000  # 10M NGN per day
@@ -265,74 +621,81 @@ def check_transaction_velocity(transaction: Transaction, customer: Customer) ->
         }
     }
 
-def detect_structuring(transaction: Transaction, customer: Customer) -> Dict[str, Any]:
-    \"\"\"Detect potential structuring patterns.\"\"\"
-    
+def detect_structuring(transaction: Transaction, customer: Customer, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Detect potential structuring patterns."""
+
     # Look for multiple transactions just below reporting thresholds
     threshold_amount = 5000000  # CTR threshold in NGN
     pattern_window = timedelta(days=1)
-    
-    # Get recent transactions near threshold
-    recent_transactions = Transaction.sql(
-        \"\"\"SELECT * FROM transactions 
-           WHERE customer_id = %(customer_id)s 
-           AND transaction_date >= %(start_time)s
-           AND amount BETWEEN %(min_amount)s AND %(max_amount)s
-           ORDER BY transaction_date DESC\"\"\",
-        {
-            "customer_id": customer.id,
-            "start_time": datetime.now() - pattern_window,
-            "min_amount": threshold_amount * 0.8,  # 80% of threshold
-            "max_amount": threshold_amount * 0.99  # Just below threshold
-        }
-    )
-    
-    pattern_indicators = {
-        "transaction_count": len(recent_transactions),
-        "total_amount": sum(float(txn["amount"]) for txn in recent_transactions),
-        "likely_structuring": False
+
+    if context is not None:
+        transaction_count = context["structuring"]["count"]
+        total_amount = float(context["structuring"]["total_amount"] or 0)
+    else:
+        # No prefetched context — aggregate recent transactions near threshold
+        recent_transactions = Transaction.sql(
+            """SELECT COUNT(*) as count, COALESCE(SUM(amount), 0) as total_amount
+               FROM transactions
+               WHERE customer_id = %(customer_id)s
+               AND transaction_date >= %(start_time)s
+               AND amount BETWEEN %(min_amount)s AND %(max_amount)s""",
+            {
+                "customer_id": customer.id,
+                "start_time": datetime.now() - pattern_window,
+                "min_amount": threshold_amount * 0.8,  # 80% of threshold
+                "max_amount": threshold_amount * 0.99  # Just below threshold
+            },
+            prepare=True
+        )
+
+        transaction_count = recent_transactions[0]["count"] if recent_transactions else 0
+        total_amount = float(recent_transactions[0]["total_amount"]) if recent_transactions else 0.0
+
+    return {
+        "transaction_count": transaction_count,
+        "total_amount": total_amount,
+        # Multiple transactions that would exceed the threshold if combined
+        "likely_structuring": transaction_count >= 3 and total_amount > threshold_amount
     }
-    
-    # Structuring indicators
-    if len(recent_transactions) >= 3:  # Multiple transactions
-        total_amount = pattern_indicators["total_amount"]
-        if total_amount > threshold_amount:  # Would exceed threshold if combined
-            pattern_indicators["likely_structuring"] = True
-    
-    return pattern_indicators
 
-def detect_transaction_patterns(transaction: Transaction, customer: Customer) -> Dict[str, Any]:
-    \"\"\"Detect additional suspicious transaction patterns.\"\"\"
-    
+def detect_transaction_patterns(transaction: Transaction, customer: Customer, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Detect additional suspicious transaction patterns."""
+
     risk_contribution = 0.0
     flags = {}
     alerts = []
-    
+
     # Unusual time patterns
     transaction_hour = transaction.transaction_date.hour
     if transaction_hour < 6 or transaction_hour > 22:  # Outside normal hours
         risk_contribution += 5.0
         flags["unusual_time"] = True
-    
-    # Round number analysis
-    if transaction.amount % 1000000 == 0 and transaction.amount >= 1000000:  # Exact millions
+
+    # Round number analysis — cheap compare first so the modulo only runs
+    # for the amounts that could qualify
+    if transaction.amount >= 1000000 and transaction.amount % 1000000 == 0:  # Exact millions
         risk_contribution += 8.0
         flags["round_amount"] = True
-    
+
     # Frequency analysis
-    customer_avg_result = Transaction.sql(
-        \"\"\"SELECT AVG(amount) as avg_amount, COUNT(*) as transaction_count
-           FROM transactions 
-           WHERE customer_id = %(customer_id)s 
-           AND transaction_date >= %(start_date)s\"\"\",
-        {
-            "customer_id": customer.id,
-            "start_date": datetime.now() - timedelta(days=30)
-        }
-    )
-    
-    if customer_avg_result and customer_avg_result[0]["avg_amount"]:
-        avg_amount = float(customer_avg_result[0]["avg_amount"])
+    if context is not None:
+        raw_avg_amount = context["avg_30d"]["avg_amount"]
+    else:
+        customer_avg_result = Transaction.sql(
+            """SELECT AVG(amount) as avg_amount, COUNT(*) as transaction_count
+               FROM transactions
+               WHERE customer_id = %(customer_id)s
+               AND transaction_date >= %(start_date)s""",
+            {
+                "customer_id": customer.id,
+                "start_date": datetime.now() - timedelta(days=30)
+            },
+            prepare=True
+        )
+        raw_avg_amount = customer_avg_result[0]["avg_amount"] if customer_avg_result else None
+
+    if raw_avg_amount:
+        avg_amount = float(raw_avg_amount)
         if transaction.amount > avg_amount * 10:  # 10x higher than average
             risk_contribution += 15.0
             flags["unusual_amount"] = True
@@ -349,11 +712,13 @@ def detect_transaction_patterns(transaction: Transaction, customer: Customer) ->
         "alerts": alerts
     }
 
-def create_alert_from_transaction(user: User, transaction: Transaction, alert_data: Dict):
-    \"\"\"Create an alert from transaction monitoring results.\"\"\"
-    
-    alert = Alert(
-        alert_id=f"TXN-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8]}",
+def build_alert_from_transaction(transaction: Transaction, alert_data: Dict, date_tag: str) -> Alert:
+    """Build (without persisting) an alert from transaction monitoring
+    results. Callers collect the alerts and flush them with one
+    multi-row sync_many."""
+
+    return Alert(
+        alert_id=f"TXN-{date_tag}-{uuid.uuid4().hex[:8]}",
         alert_type="transaction_monitoring",
         alert_category="aml",
         customer_id=transaction.customer_id,
@@ -368,37 +733,27 @@ def create_alert_from_transaction(user: User, transaction: Transaction, alert_da
         detection_method="rule_based",
         regulatory_significance=True
     )
-    
-    alert.sync()
-    
-    # Log alert creation
-    log_audit_event(
-        user_id=user.id,
-        event_type="alert_generated",
-        action="create",
-        resource_type="alert",
-        resource_id=alert.id,
-        description=f"Alert generated for transaction {transaction.transaction_id}",
-        details=alert_data
-    )
 
 @authenticated
 def get_suspicious_transactions(user: User, days: int = 7, limit: int = 100) -> List[Transaction]:
-    \"\"\"Get suspicious transactions for review.\"\"\"
+    """Get suspicious transactions for review."""
     
     results = Transaction.sql(
-        \"\"\"SELECT * FROM transactions 
+        """SELECT * FROM transactions 
            WHERE is_suspicious = true 
            AND transaction_date >= %(start_date)s
            ORDER BY risk_score DESC, transaction_date DESC
-           LIMIT %(limit)s\"\"\",
+           LIMIT %(limit)s""",
         {
             "start_date": datetime.now() - timedelta(days=days),
             "limit": limit
-        }
+        },
+        prepare=True
     )
-    
-    transactions = [Transaction(**result) for result in results]
+
+    # Rows come straight off this table's columns, so skip re-validating
+    # every field per row — at limit=100 that is the bulk of the cost
+    transactions = [Transaction.construct_fast(result) for result in results]
     
     # Log access
     log_audit_event(
@@ -412,7 +767,7 @@ def get_suspicious_transactions(user: User, days: int = 7, limit: int = 100) ->
     
     return transactions
 
-def log_audit_event(
+def build_audit_event(
     user_id: uuid.UUID,
     event_type: str,
     action: str,
@@ -421,10 +776,10 @@ def log_audit_event(
     resource_id: Optional[uuid.UUID] = None,
     details: Optional[Dict] = None,
     records_affected: Optional[int] = None
-):
-    \"\"\"Log an audit event for compliance tracking.\"\"\"
-    
-    audit_log = AuditLog(
+) -> AuditLog:
+    """Build (without persisting) an audit event for compliance tracking."""
+
+    return AuditLog(
         event_id=str(uuid.uuid4()),
         event_type=event_type,
         event_category="transaction_monitoring",
@@ -437,5 +792,26 @@ def log_audit_event(
         records_affected=records_affected,
         regulatory_significance=True
     )
-    
-    audit_log.sync()
\ No newline at end of file
+
+def log_audit_event(
+    user_id: uuid.UUID,
+    event_type: str,
+    action: str,
+    resource_type: str,
+    description: str,
+    resource_id: Optional[uuid.UUID] = None,
+    details: Optional[Dict] = None,
+    records_affected: Optional[int] = None
+):
+    """Log an audit event for compliance tracking."""
+
+    audit_writer.enqueue(build_audit_event(
+        user_id=user_id,
+        event_type=event_type,
+        action=action,
+        resource_type=resource_type,
+        description=description,
+        resource_id=resource_id,
+        details=details,
+        records_affected=records_affected
+    ))
\ No newline at end of file
@@ -0,0 +1,23 @@
+-- Composite and partial B-tree indexes covering the hot filter predicates in
+-- core/audit_service.py (search_audit_logs, get_compliance_audit_trail,
+-- get_user_activity_summary, detect_suspicious_patterns, export_audit_logs).
+-- Without these the timestamp/user/resource filters degrade to sequential
+-- scans as the audit_logs table grows.
+
+CREATE INDEX IF NOT EXISTS idx_audit_resource
+    ON audit_logs (resource_type, resource_id, timestamp DESC);
+
+CREATE INDEX IF NOT EXISTS idx_audit_user_ts
+    ON audit_logs (user_id, timestamp DESC)
+    WHERE user_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_audit_ts_cat
+    ON audit_logs (timestamp DESC, event_category);
+
+CREATE INDEX IF NOT EXISTS idx_audit_suspicious
+    ON audit_logs (timestamp)
+    WHERE suspicious_activity = true;
+
+CREATE INDEX IF NOT EXISTS idx_audit_regulatory
+    ON audit_logs (timestamp)
+    WHERE regulatory_significance = true;
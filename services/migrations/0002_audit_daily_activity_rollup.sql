@@ -0,0 +1,18 @@
+-- Daily activity rollup backing the dashboard trend in
+-- get_system_activity_report. Closed days never change, so recomputing
+-- them from audit_logs on every dashboard hit is wasted work; the
+-- materialized view serves them directly and only the current day is
+-- aggregated live.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS audit_daily_activity AS
+    SELECT
+        DATE(timestamp) AS activity_date,
+        COUNT(*) AS event_count,
+        COUNT(DISTINCT user_id) AS unique_users
+    FROM audit_logs
+    WHERE timestamp < CURRENT_DATE
+    GROUP BY DATE(timestamp);
+
+-- Unique index required for REFRESH MATERIALIZED VIEW CONCURRENTLY.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_audit_daily_activity_date
+    ON audit_daily_activity (activity_date);
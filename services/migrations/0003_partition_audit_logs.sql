@@ -0,0 +1,98 @@
+-- Convert audit_logs to monthly range partitions on timestamp. Postgres
+-- cannot partition a table in place, so the existing table is swapped out,
+-- recreated as a partitioned parent and backfilled. The primary key gains
+-- the partition column, as required for partitioned tables.
+--
+-- Partition maintenance is exposed as two functions intended for a daily
+-- scheduler (see maintain_audit_partitions in core/audit_service.py):
+--   ensure_audit_log_partitions(months_ahead) pre-creates upcoming months;
+--   drop_expired_audit_log_partitions(retention_months) detaches and drops
+--   partitions entirely past the retention horizon, which reclaims space
+--   instantly instead of row-by-row deletes.
+
+ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned;
+
+-- No INCLUDING INDEXES: it would copy the old single-column primary key,
+-- which both collides with the explicit composite key and is illegal on a
+-- table partitioned by timestamp (unique indexes must include the
+-- partition column). The secondary indexes from 0001 are recreated
+-- explicitly below, once the old table — which still owns those index
+-- names — has been dropped.
+CREATE TABLE audit_logs (
+    LIKE audit_logs_unpartitioned INCLUDING DEFAULTS,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+-- Catch-all for rows outside any explicit monthly partition (e.g. backdated
+-- imports) so inserts never fail.
+CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;
+
+CREATE OR REPLACE FUNCTION ensure_audit_log_partitions(months_ahead int DEFAULT 1)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    month_start date;
+    partition_name text;
+BEGIN
+    FOR offset_months IN 0..months_ahead LOOP
+        month_start := date_trunc('month', CURRENT_DATE) + (offset_months || ' months')::interval;
+        partition_name := 'audit_logs_' || to_char(month_start, 'YYYYMM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                month_start,
+                month_start + interval '1 month'
+            );
+        END IF;
+    END LOOP;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION drop_expired_audit_log_partitions(retention_months int DEFAULT 60)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    cutoff date := date_trunc('month', CURRENT_DATE) - (retention_months || ' months')::interval;
+    partition record;
+BEGIN
+    FOR partition IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = 'audit_logs'
+        AND c.relname ~ '^audit_logs_[0-9]{6}$'
+        AND to_date(substring(c.relname from '[0-9]{6}$'), 'YYYYMM')
+            < cutoff - interval '1 month'
+    LOOP
+        EXECUTE format('ALTER TABLE audit_logs DETACH PARTITION %I', partition.relname);
+        EXECUTE format('DROP TABLE %I', partition.relname);
+    END LOOP;
+END;
+$$;
+
+-- Create the current and next month, then backfill and drop the old table.
+SELECT ensure_audit_log_partitions(1);
+
+INSERT INTO audit_logs SELECT * FROM audit_logs_unpartitioned;
+
+DROP TABLE audit_logs_unpartitioned;
+
+-- Recreate the 0001 secondary indexes on the partitioned parent; they
+-- cascade to every partition, present and future.
+CREATE INDEX IF NOT EXISTS idx_audit_resource
+    ON audit_logs (resource_type, resource_id, timestamp DESC);
+
+CREATE INDEX IF NOT EXISTS idx_audit_user_ts
+    ON audit_logs (user_id, timestamp DESC)
+    WHERE user_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_audit_ts_cat
+    ON audit_logs (timestamp DESC, event_category);
+
+CREATE INDEX IF NOT EXISTS idx_audit_suspicious
+    ON audit_logs (timestamp)
+    WHERE suspicious_activity = true;
+
+CREATE INDEX IF NOT EXISTS idx_audit_regulatory
+    ON audit_logs (timestamp)
+    WHERE regulatory_significance = true;
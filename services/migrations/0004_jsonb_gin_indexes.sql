@@ -0,0 +1,25 @@
+-- GIN indexes for the JSONB payload columns so containment queries
+-- (details @> ..., tags @> ...) can use bitmap index scans instead of
+-- scanning and decoding every row. jsonb_path_ops keeps the audit-side
+-- indexes small since those columns are only queried by containment.
+
+CREATE INDEX IF NOT EXISTS idx_audit_details_gin
+    ON audit_logs USING GIN (details jsonb_path_ops);
+
+CREATE INDEX IF NOT EXISTS idx_audit_tags_gin
+    ON audit_logs USING GIN (tags jsonb_path_ops);
+
+CREATE INDEX IF NOT EXISTS idx_audit_security_flags_gin
+    ON audit_logs USING GIN (security_flags jsonb_path_ops);
+
+CREATE INDEX IF NOT EXISTS idx_alert_evidence_gin
+    ON alerts USING GIN (evidence jsonb_path_ops);
+
+-- Typed expression index for the compliance lookup "which users accessed
+-- activity for a given subject": audit events record the subject in
+-- details->>'target_user', which would otherwise force a full decode of
+-- details on every probe.
+
+CREATE INDEX IF NOT EXISTS idx_audit_details_target_user
+    ON audit_logs ((details ->> 'target_user'))
+    WHERE details ? 'target_user';
@@ -0,0 +1,13 @@
+-- EXTRACT(HOUR FROM timestamp) in the unusual-login predicate is
+-- non-sargable and forces a scan of every candidate row. A stored
+-- generated column moves the extraction to write time, and a partial
+-- index over the off-hours band lets the planner serve the detection
+-- query with an index scan regardless of table size.
+
+ALTER TABLE audit_logs
+    ADD COLUMN IF NOT EXISTS hour_of_day SMALLINT
+    GENERATED ALWAYS AS (EXTRACT(HOUR FROM timestamp)::smallint) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_audit_unusual_hours
+    ON audit_logs (user_id, timestamp)
+    WHERE hour_of_day < 6 OR hour_of_day > 22;
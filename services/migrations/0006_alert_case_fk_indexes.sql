@@ -0,0 +1,23 @@
+-- alerts and cases are filtered by customer and by assignee on every
+-- case-load screen, but none of those UUID columns are indexed, so the
+-- screens degrade to sequential scans as history accumulates. Composite
+-- indexes cover the per-customer timelines; partial indexes keep the
+-- open-work lookups small regardless of how much closed history exists.
+
+CREATE INDEX IF NOT EXISTS idx_alerts_customer
+    ON alerts (customer_id, triggered_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_alerts_assigned_open
+    ON alerts (assigned_to)
+    WHERE status IN ('open', 'investigating');
+
+CREATE INDEX IF NOT EXISTS idx_alerts_case
+    ON alerts (case_id)
+    WHERE case_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_cases_customer
+    ON cases (customer_id, opened_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_cases_assigned_open
+    ON cases (assigned_to)
+    WHERE status != 'closed';
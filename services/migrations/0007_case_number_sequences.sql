@@ -0,0 +1,21 @@
+-- Case numbers were derived from COUNT(*) over the current month, which
+-- both scans the month on every insert and races under concurrency.
+-- Numbering now comes from one Postgres sequence per month
+-- (case_seq_YYYYMM), created lazily by the application. Seed the
+-- current month's sequence past the existing numbers so the switch
+-- cannot hand out duplicates mid-month.
+
+DO $$
+DECLARE
+    period text := to_char(CURRENT_DATE, 'YYYYMM');
+    existing bigint;
+BEGIN
+    SELECT COUNT(*) INTO existing
+    FROM cases
+    WHERE date_trunc('month', created_at) = date_trunc('month', CURRENT_DATE);
+
+    EXECUTE format(
+        'CREATE SEQUENCE IF NOT EXISTS case_seq_%s START WITH %s',
+        period, existing + 1
+    );
+END $$;
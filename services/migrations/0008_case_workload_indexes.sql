@@ -0,0 +1,24 @@
+-- Covering indexes for the hot case-management and risk-scoring queries.
+-- The assignee index from 0006 is widened to carry the sort keys of
+-- get_assigned_cases (priority, sla_deadline) so the queue renders from
+-- an index scan without a sort; the overdue sweep and the high-risk
+-- review list get partial indexes matching their predicates; and the
+-- 90-day risk aggregation over transactions becomes an index-only scan
+-- via INCLUDE of the aggregated columns.
+
+DROP INDEX IF EXISTS idx_cases_assigned_open;
+CREATE INDEX IF NOT EXISTS idx_cases_assigned_open
+    ON cases (assigned_to, priority, sla_deadline)
+    WHERE status != 'closed';
+
+CREATE INDEX IF NOT EXISTS idx_cases_overdue
+    ON cases (sla_deadline)
+    WHERE status != 'closed';
+
+CREATE INDEX IF NOT EXISTS idx_tx_customer_date
+    ON transactions (customer_id, transaction_date DESC)
+    INCLUDE (amount, cash_transaction);
+
+CREATE INDEX IF NOT EXISTS idx_customers_high_risk
+    ON customers (risk_score DESC, last_risk_assessment ASC)
+    WHERE risk_category = 'high';
@@ -0,0 +1,10 @@
+-- Screening the same identity against the UN/OFAC/EFCC/PEP providers
+-- repeatedly is pure cost: the answer only changes when the lists or the
+-- identity do. Results are memoized per identity hash with a TTL so
+-- re-screens within the freshness window skip the provider round trip.
+
+CREATE TABLE IF NOT EXISTS sanctions_screening_cache (
+    identity_hash TEXT PRIMARY KEY,
+    result JSONB NOT NULL,
+    checked_at TIMESTAMP NOT NULL DEFAULT now()
+);
@@ -0,0 +1,23 @@
+-- Report numbers were derived from COUNT(*) over the month per report
+-- type — a scan per filing and a duplicate-number race under concurrent
+-- creation. Numbering now comes from a report_counters table bumped with
+-- an atomic upsert. Seed the current month from existing reports so the
+-- cutover cannot hand out numbers already in use.
+
+CREATE TABLE IF NOT EXISTS report_counters (
+    report_type TEXT NOT NULL,
+    year INT NOT NULL,
+    month INT NOT NULL,
+    counter INT NOT NULL,
+    PRIMARY KEY (report_type, year, month)
+);
+
+INSERT INTO report_counters (report_type, year, month, counter)
+SELECT report_type,
+       EXTRACT(YEAR FROM CURRENT_DATE)::int,
+       EXTRACT(MONTH FROM CURRENT_DATE)::int,
+       COUNT(*)
+FROM reports
+WHERE date_trunc('month', created_at) = date_trunc('month', CURRENT_DATE)
+GROUP BY report_type
+ON CONFLICT (report_type, year, month) DO NOTHING;
@@ -0,0 +1,17 @@
+-- get_pending_reports and get_filed_reports both seq-scanned reports and
+-- sorted in memory. Partial indexes matching their WHERE clauses give an
+-- indexed range scan already in the requested order; status/report_type
+-- ride along as INCLUDE columns so the filters resolve from the index.
+
+CREATE INDEX IF NOT EXISTS idx_reports_pending
+    ON reports (created_at DESC)
+    INCLUDE (status, report_type)
+    WHERE filed = false AND status IN ('draft', 'review', 'approved');
+
+CREATE INDEX IF NOT EXISTS idx_reports_pending_by_type
+    ON reports (report_type, created_at DESC)
+    WHERE filed = false AND status IN ('draft', 'review', 'approved');
+
+CREATE INDEX IF NOT EXISTS idx_reports_filed
+    ON reports (filing_date DESC)
+    WHERE filed = true;
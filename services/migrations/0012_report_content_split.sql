@@ -0,0 +1,41 @@
+-- reports carried ~60 columns including large text/jsonb payloads
+-- (narrative, subject_information, export_data, ...) that only single-
+-- report views and filing exports read, yet every listing and statistics
+-- scan streamed and detoasted them. The cold columns move to a 1:1
+-- report_content table keyed by report id; reports keeps the narrow
+-- columns the listing endpoints actually return.
+
+CREATE TABLE IF NOT EXISTS report_content (
+    report_id UUID PRIMARY KEY REFERENCES reports(id),
+    narrative TEXT NOT NULL DEFAULT '',
+    summary TEXT NOT NULL DEFAULT '',
+    subject_information JSONB NOT NULL DEFAULT '{}'::jsonb,
+    involved_parties JSONB[] NOT NULL DEFAULT ARRAY[]::jsonb[],
+    follow_up_requests JSONB[] NOT NULL DEFAULT ARRAY[]::jsonb[],
+    investigation_notes TEXT NOT NULL DEFAULT '',
+    export_data JSONB
+);
+
+INSERT INTO report_content (
+    report_id, narrative, summary, subject_information,
+    involved_parties, follow_up_requests, investigation_notes, export_data
+)
+SELECT id,
+       COALESCE(narrative, ''),
+       COALESCE(summary, ''),
+       COALESCE(subject_information, '{}'::jsonb),
+       COALESCE(involved_parties, ARRAY[]::jsonb[]),
+       COALESCE(follow_up_requests, ARRAY[]::jsonb[]),
+       COALESCE(investigation_notes, ''),
+       export_data
+FROM reports
+ON CONFLICT (report_id) DO NOTHING;
+
+ALTER TABLE reports
+    DROP COLUMN IF EXISTS narrative,
+    DROP COLUMN IF EXISTS summary,
+    DROP COLUMN IF EXISTS subject_information,
+    DROP COLUMN IF EXISTS involved_parties,
+    DROP COLUMN IF EXISTS follow_up_requests,
+    DROP COLUMN IF EXISTS investigation_notes,
+    DROP COLUMN IF EXISTS export_data;
@@ -0,0 +1,38 @@
+-- Report creation made a pre-INSERT round trip to bump report_counters
+-- and then inserted the report. A BEFORE INSERT trigger now bumps the
+-- counter and fills report_number inside the insert itself whenever the
+-- client sends NULL, so single-report creation costs one round trip and
+-- numbering cannot be bypassed by raw-SQL ingest. Batch paths that
+-- pre-reserve a block of numbers still pass them explicitly; the trigger
+-- leaves non-NULL values alone.
+
+CREATE OR REPLACE FUNCTION fill_report_number() RETURNS trigger AS $$
+DECLARE
+    seq INT;
+BEGIN
+    IF NEW.report_number IS NULL THEN
+        INSERT INTO report_counters (report_type, year, month, counter)
+        VALUES (NEW.report_type,
+                EXTRACT(YEAR FROM CURRENT_DATE)::int,
+                EXTRACT(MONTH FROM CURRENT_DATE)::int,
+                1)
+        ON CONFLICT (report_type, year, month)
+        DO UPDATE SET counter = report_counters.counter + 1
+        RETURNING counter INTO seq;
+
+        NEW.report_number := format(
+            '%s-%s-%s',
+            NEW.report_type,
+            to_char(CURRENT_DATE, 'YYYYMM'),
+            lpad(seq::text, 4, '0')
+        );
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_reports_fill_number ON reports;
+CREATE TRIGGER trg_reports_fill_number
+    BEFORE INSERT ON reports
+    FOR EACH ROW
+    EXECUTE FUNCTION fill_report_number();
@@ -0,0 +1,10 @@
+-- Report creation and the jsonb subject payloads concatenate
+-- first_name/last_name wherever a display name is needed. A stored
+-- generated column computes it once per row write, gives SQL paths a
+-- single column to read, and makes name search indexable.
+
+ALTER TABLE customers
+    ADD COLUMN IF NOT EXISTS full_name TEXT
+    GENERATED ALWAYS AS (first_name || ' ' || last_name) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_customers_full_name ON customers (full_name);
@@ -0,0 +1,21 @@
+-- Period aggregations over transactions (dashboard totals, CTR-volume
+-- queries) rescanned the base table on every request even though
+-- historical days never change. A daily per-customer rollup answers
+-- those from N_customers x N_days rows instead. The unique index lets
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY keep the view readable during
+-- the nightly refresh (see refresh_customer_daily_totals in the
+-- reporting service).
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS customer_daily_totals AS
+SELECT customer_id,
+       date_trunc('day', created_at) AS day,
+       COUNT(*) AS transaction_count,
+       SUM(amount) AS total_amount,
+       COUNT(*) FILTER (WHERE cash_transaction) AS cash_transaction_count,
+       SUM(amount) FILTER (WHERE above_ctr_threshold) AS ctr_total,
+       COUNT(*) FILTER (WHERE above_ctr_threshold) AS ctr_count
+FROM transactions
+GROUP BY customer_id, date_trunc('day', created_at);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_customer_daily_totals
+    ON customer_daily_totals (customer_id, day);
@@ -0,0 +1,12 @@
+-- The content columns are the largest values in the system (multi-KB
+-- narratives, export payloads). LZ4 toast compression is several times
+-- faster than the default pglz on both write and detoast for a near-
+-- identical ratio on JSON/text. Only newly written values pick up the
+-- new method; existing rows keep pglz until rewritten.
+
+ALTER TABLE report_content
+    ALTER COLUMN narrative SET COMPRESSION lz4,
+    ALTER COLUMN summary SET COMPRESSION lz4,
+    ALTER COLUMN subject_information SET COMPRESSION lz4,
+    ALTER COLUMN investigation_notes SET COMPRESSION lz4,
+    ALTER COLUMN export_data SET COMPRESSION lz4;
@@ -0,0 +1,7 @@
+-- Rule codes have always been unique by convention (create_aml_rule
+-- pre-checked with a COUNT query). Enforcing it with a unique index lets
+-- batch inserts use ON CONFLICT (rule_code) DO NOTHING instead of a
+-- per-rule existence round trip, and speeds up lookups by code.
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_rules_rule_code
+    ON rules (rule_code);
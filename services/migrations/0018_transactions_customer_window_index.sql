@@ -0,0 +1,14 @@
+-- Every monitoring-context lookup aggregates a customer's recent
+-- transactions (24h velocity, near-CTR structuring window, 30-day
+-- average). Without an index that is a scan of the customer's whole
+-- history per transaction processed. A covering index on
+-- (customer_id, transaction_date) with amount included lets all three
+-- window aggregates run as short index-only range scans — the window
+-- rows are contiguous and the heap is never touched. Chosen over a
+-- trigger-maintained rolling-counters table: the structuring window
+-- filters on an amount band, so materialized counters could not answer
+-- it exactly and would need decay machinery for the sliding windows.
+
+CREATE INDEX IF NOT EXISTS idx_transactions_customer_date
+    ON transactions (customer_id, transaction_date)
+    INCLUDE (amount);
@@ -1,4 +1,4 @@
-from .table import Table, ColumnDetails
+from .table import Table, ColumnDetails, run_parallel
 from .access import authenticated, User, public
 
-__all__ = [Table, ColumnDetails, authenticated, User, public]
+__all__ = [Table, ColumnDetails, run_parallel, authenticated, User, public]
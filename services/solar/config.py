@@ -93,6 +93,12 @@ class Config:
             return "NEON_CONN_URL"
         return connection_string_val
 
+    def redis_url(self, throw_if_missing: bool = False) -> Optional[str]:
+        """Get the Redis connection URL for the shared result cache."""
+        redis_url_val = os.getenv("REDIS_URL")
+        self._throw_if_missing(throw_if_missing, redis_url_val, "REDIS_URL")
+        return redis_url_val
+
     def model_api_key(self, throw_if_missing: bool = True) -> str:
         """Get the OpenRouter API key for model access."""
         api_key = os.getenv("OPENROUTER_API_KEY")
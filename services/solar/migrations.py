@@ -0,0 +1,75 @@
+######################################################################################################################
+# General Information
+######################################################################################################################
+# This file contains the migration runner for the plain-SQL migrations stored in services/migrations. Files are
+# applied in lexical order and recorded in a schema_migrations table so each one runs exactly once per database.
+
+
+######################################################################################################################
+# Dependencies
+######################################################################################################################
+
+
+from pathlib import Path
+from typing import List, Optional
+
+from .table import get_pool
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+
+######################################################################################################################
+# Migration Runner
+######################################################################################################################
+
+
+def get_applied_migrations(pg_key: str = "NEON_CONN_URL") -> set:
+    """Get the set of migration versions already applied to the database."""
+    pool = get_pool()[pg_key]
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """CREATE TABLE IF NOT EXISTS schema_migrations (
+                       version text PRIMARY KEY,
+                       applied_at timestamptz NOT NULL DEFAULT now()
+                   )"""
+            )
+            cur.execute("SELECT version FROM schema_migrations")
+            return {row["version"] for row in cur.fetchall()}
+
+
+def run_migrations(
+    pg_key: str = "NEON_CONN_URL", migrations_dir: Optional[Path] = None
+) -> List[str]:
+    """Apply any pending SQL migrations, returning the versions applied in order."""
+    migrations_dir = migrations_dir or MIGRATIONS_DIR
+    if not migrations_dir.exists():
+        logger.debug(f"No migrations directory at {migrations_dir}, skipping")
+        return []
+
+    already_applied = get_applied_migrations(pg_key)
+    pool = get_pool()[pg_key]
+    applied = []
+
+    for path in sorted(migrations_dir.glob("*.sql")):
+        if path.name in already_applied:
+            continue
+        try:
+            with pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(path.read_text())
+                    cur.execute(
+                        "INSERT INTO schema_migrations (version) VALUES (%s)",
+                        (path.name,),
+                    )
+            applied.append(path.name)
+            logger.info(f"Applied migration {path.name}")
+        except Exception as e:
+            logger.error(f"Migration {path.name} failed: {str(e)}")
+            raise
+
+    return applied
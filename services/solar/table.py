@@ -10,7 +10,9 @@
 ######################################################################################################################
 
 
-from typing import Dict, Any, Optional
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 
 from psycopg.rows import dict_row
@@ -18,16 +20,24 @@ from psycopg_pool import ConnectionPool
 from psycopg import Connection, Error as PsycopgError
 from psycopg.types.json import Jsonb
 
+import orjson
+
 from .config import config
 
 import logging
+import os
 import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
-# Pool configuration constants
-DEFAULT_MIN_SIZE = 1
-DEFAULT_MAX_SIZE = 10
+# Pool configuration constants. The workload is many short single-row
+# queries, so keeping warm connections matters more than capping idle ones:
+# min_size holds enough connections open that steady traffic never pays
+# connection setup, and both bounds can be tuned per deployment to match
+# expected request concurrency.
+DEFAULT_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", "5"))
+DEFAULT_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", "25"))
 DEFAULT_TIMEOUT = 30  # seconds
 DEFAULT_KEEPALIVE = 60  # seconds
 DEFAULT_RECONNECT_TIMEOUT = 5  # seconds
@@ -37,6 +47,22 @@ _pool = None
 _last_pool_check = 0
 _pool_check_interval = 300  # Check pool health every 5 minutes
 
+# Executor for overlapping independent .sql() calls. Kept small because each
+# in-flight call holds a pooled connection for its duration.
+_PARALLEL_WORKERS = int(os.environ.get("DB_PARALLEL_WORKERS", "4"))
+_parallel_executor = ThreadPoolExecutor(
+    max_workers=_PARALLEL_WORKERS, thread_name_prefix="solar-parallel"
+)
+
+
+def run_parallel(*calls):
+    """Run independent no-argument callables (typically lambdas wrapping
+    Table.sql) concurrently and return their results in call order. The
+    driver blocks a thread per query, so overlapping the round trips
+    recovers most of what an async driver would for independent queries."""
+    futures = [_parallel_executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
 
 class SchemaConnection(Connection):
     def __init__(self, *args, **kwargs):
@@ -121,6 +147,13 @@ def get_pool(reset: bool = False) -> Dict[str, ConnectionPool]:
 ######################################################################################################################
 
 
+def jsonb_dumps(value) -> bytes:
+    """Serialize a jsonb payload with orjson, which handles UUID and
+    datetime natively — callers can put raw objects in payload dicts
+    instead of pre-stringifying every field."""
+    return orjson.dumps(value, default=str)
+
+
 def ColumnDetails(*args, primary_key: bool = False, **kwargs):
     """Wrap Field to bring some metadata args top-level"""
     if not hasattr(kwargs, "json_schema_extra"):
@@ -151,7 +184,11 @@ class Table(BaseModel):
         params: Dict[str, Any] | None = None,
         schema_name: str = "public",
         max_retries: int = 3,
+        prepare: Optional[bool] = None,
     ):
+        # prepare=True server-side-prepares the statement on first use so hot
+        # templated queries skip re-parse/re-plan immediately; the default
+        # None keeps psycopg's auto-preparation after repeated executions.
         pg_key = config.get_pg_key_for_table(cls.__name__)
         pool = get_pool()
         retry_count = 0
@@ -174,7 +211,7 @@ class Table(BaseModel):
                         try:
                             if schema_name != "public" and schema_name != "auth":
                                 cursor.execute(f"SET search_path TO {schema_name}")
-                            cursor.execute(sql_statement, params)
+                            cursor.execute(sql_statement, params, prepare=prepare)
                             if cursor.description is not None:
                                 return cursor.fetchall()
                             else:
@@ -225,6 +262,145 @@ class Table(BaseModel):
                         except Exception:
                             pass
 
+    _row_view_types: Dict[type, Any] = {}
+
+    @classmethod
+    def row_view_type(cls):
+        """Return the slot-based, immutable row view type for this table.
+
+        Pydantic model instances carry a per-instance __dict__ plus
+        validation machinery; for internal read-only bulk processing a
+        namedtuple view of the same columns is far smaller and cheaper to
+        build. Views never reach the API boundary — endpoints keep returning
+        the pydantic models."""
+        view = Table._row_view_types.get(cls)
+        if view is None:
+            view = namedtuple(f"{cls.__name__}View", list(cls.model_fields))
+            Table._row_view_types[cls] = view
+        return view
+
+    @classmethod
+    def view_rows(cls, rows: list) -> list:
+        """Build row views from query result dicts, defaulting absent columns
+        to None so projected queries still map cleanly."""
+        view = cls.row_view_type()
+        fields = view._fields
+        return [view(*(row.get(field) for field in fields)) for row in rows]
+
+    @classmethod
+    def construct_fast(cls, row: dict):
+        """Hydrate a full model instance from a trusted, driver-typed row
+        without re-running per-field validation.
+
+        Only for rows read directly from this table's columns, where the
+        driver already returns uuid/datetime/Decimal objects. Rows folded
+        through to_jsonb carry strings for those values and must go through
+        normal `cls(**row)` validation."""
+        return cls.model_construct(**row)
+
+    def update_fields(self, **values):
+        """Set several already-validated field values in one call, writing
+        straight to the instance dict instead of going through pydantic's
+        per-attribute __setattr__ validation. The write-path analogue of
+        construct_fast: only for values computed in-process from trusted
+        data."""
+        self.__dict__.update(values)
+        return self
+
+    @classmethod
+    def _get_primary_key_columns(cls) -> List[str]:
+        """All columns marked primary_key, in declaration order. Tables
+        normally have a single-column key; partitioned tables (audit_logs)
+        carry a composite key including the partition column, and the
+        upsert conflict target must name every column of it."""
+        return [
+            field_name
+            for field_name, field_info in cls.model_fields.items()
+            if field_info.json_schema_extra
+            and field_info.json_schema_extra.get("primary_key", False)
+        ]
+
+    @classmethod
+    def copy_insert(cls, objects: list):
+        """Bulk-insert rows via COPY ... FROM STDIN, the fastest ingest path
+        Postgres offers. Unlike sync_many this performs no upsert, so it is
+        only suitable for insert-only tables such as append-only logs."""
+        if not objects:
+            return
+
+        table_name = cls._get_sql_table_name()
+        if table_name is None:
+            raise ValueError("Cannot copy without a table name defined")
+
+        columns = list(objects[0].model_dump().keys())
+        columns_str = ", ".join(columns)
+
+        pg_key = config.get_pg_key_for_table(cls.__name__)
+        pool = get_pool()
+
+        if pg_key not in pool:
+            pool = get_pool(reset=True)
+
+        current_pool = pool[pg_key]
+        conn = current_pool.getconn()
+
+        try:
+            with conn:
+                with conn.cursor() as cursor:
+                    with cursor.copy(
+                        f"COPY {table_name} ({columns_str}) FROM STDIN"
+                    ) as copy:
+                        for obj in objects:
+                            data = obj.model_dump()
+                            copy.write_row(
+                                [obj._prepare_value(data[col]) for col in columns]
+                            )
+        finally:
+            try:
+                current_pool.putconn(conn)
+            except Exception:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    @classmethod
+    def sql_stream(
+        cls,
+        sql_statement: str,
+        params: Dict[str, Any] | None = None,
+        batch_size: int = 1000,
+    ):
+        """Stream a SELECT through a server-side cursor, yielding rows without
+        materializing the full result set in memory. Intended for exports and
+        other large scans; the connection is held until the generator is
+        exhausted or closed."""
+        pg_key = config.get_pg_key_for_table(cls.__name__)
+        pool = get_pool()
+
+        if pg_key not in pool:
+            pool = get_pool(reset=True)
+
+        current_pool = pool[pg_key]
+        conn = current_pool.getconn()
+
+        try:
+            with conn:
+                # A named cursor makes psycopg use a server-side cursor and
+                # fetch rows in batches of itersize
+                with conn.cursor(name=f"stream_{uuid.uuid4().hex}") as cursor:
+                    cursor.itersize = batch_size
+                    cursor.execute(sql_statement, params)
+                    yield from cursor
+        finally:
+            try:
+                current_pool.putconn(conn)
+            except Exception:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
     def _prepare_value(self, value):
         """Helper to recursively prepare values for database insertion"""
         if isinstance(value, list):
@@ -233,11 +409,13 @@ class Table(BaseModel):
                 return [self._prepare_value(item) for item in value]
             return value
         elif isinstance(value, dict):
-            return Jsonb(value)
+            return Jsonb(value, dumps=jsonb_dumps)
         return value
 
-    def sync(self):
-        """Sync the model to the database"""
+    def sync(self, returning: Optional[List[str]] = None):
+        """Sync the model to the database. Pass `returning` to get columns
+        back from the upsert in the same round trip — e.g. values filled in
+        by database triggers or defaults."""
         table_name = self.__class__._get_sql_table_name()
         if table_name is None:
             raise ValueError("Cannot sync without a table name defined")
@@ -252,15 +430,8 @@ class Table(BaseModel):
             values.append(self._prepare_value(value))
 
         # Find primary key
-        primary_key = None
-        for field_name, field_info in self.__class__.model_fields.items():
-            if field_info.json_schema_extra and field_info.json_schema_extra.get(
-                "primary_key", False
-            ):
-                primary_key = field_name
-                break
-
-        if not primary_key:
+        primary_key_columns = self.__class__._get_primary_key_columns()
+        if not primary_key_columns:
             raise ValueError("Cannot sync without a primary key defined")
 
         # Build the SQL statement
@@ -271,22 +442,30 @@ class Table(BaseModel):
         sql_statement = f"""
             INSERT INTO {table_name} ({columns_str})
             VALUES ({placeholders})
-            ON CONFLICT ({primary_key}) DO UPDATE
+            ON CONFLICT ({", ".join(primary_key_columns)}) DO UPDATE
             SET {set_clause}
         """
+        if returning:
+            sql_statement += f" RETURNING {', '.join(returning)}"
+            return self.__class__.sql(sql_statement, values)
         self.__class__.sql(sql_statement, values)
 
     @classmethod
-    def sync_many(cls, objects, batch_size=1000):
+    def sync_many(cls, objects, batch_size=1000, on_conflict=None, returning=None):
         """
         Sync multiple model instances to the database in batched transactions.
 
         Args:
             objects: A single model instance or a list of model instances
             batch_size: Maximum number of objects to sync in a single transaction
+            on_conflict: Optional non-primary-key unique column to use as the
+                conflict target; conflicting rows are skipped (DO NOTHING)
+                instead of updated
+            returning: Optional list of columns to return from the written
+                rows in the same round trip
 
         Returns:
-            None
+            The returned rows when `returning` is set, otherwise None
 
         Raises:
             ValueError: If no table name is defined or no primary key is found
@@ -296,25 +475,19 @@ class Table(BaseModel):
             objects = [objects]
 
         if not objects:
-            return  # Nothing to sync
+            return [] if returning else None  # Nothing to sync
 
         table_name = cls._get_sql_table_name()
         if table_name is None:
             raise ValueError("Cannot sync without a table name defined")
 
         # Find primary key
-        primary_key = None
-        for field_name, field_info in cls.model_fields.items():
-            if field_info.json_schema_extra and field_info.json_schema_extra.get(
-                "primary_key", False
-            ):
-                primary_key = field_name
-                break
-
-        if not primary_key:
+        primary_key_columns = cls._get_primary_key_columns()
+        if not primary_key_columns:
             raise ValueError("Cannot sync without a primary key defined")
 
         # Process in batches
+        returned_rows = []
         for i in range(0, len(objects), batch_size):
             upper_idx = min(i + batch_size, len(objects))
             batch = objects[i:upper_idx]
@@ -324,7 +497,11 @@ class Table(BaseModel):
             columns = list(batch[0].model_dump().keys())
             columns_str = ", ".join(columns)
             placeholders = ", ".join(["%s"] * len(columns))
-            set_clause = ", ".join([f"{col} = EXCLUDED.{col}" for col in columns])
+            if on_conflict and [on_conflict] != primary_key_columns:
+                conflict_clause = f"ON CONFLICT ({on_conflict}) DO NOTHING"
+            else:
+                set_clause = ", ".join([f"{col} = EXCLUDED.{col}" for col in columns])
+                conflict_clause = f"ON CONFLICT ({', '.join(primary_key_columns)}) DO UPDATE\n                SET {set_clause}"
 
             # Collect values for this batch
             for obj in batch:
@@ -346,8 +523,14 @@ class Table(BaseModel):
             sql_statement = f"""
                 INSERT INTO {table_name} ({columns_str})
                 VALUES {values_placeholders}
-                ON CONFLICT ({primary_key}) DO UPDATE
-                SET {set_clause}
+                {conflict_clause}
             """
 
-            cls.sql(sql_statement, all_values)
+            if returning:
+                sql_statement += f" RETURNING {', '.join(returning)}"
+                returned_rows.extend(cls.sql(sql_statement, all_values))
+            else:
+                cls.sql(sql_statement, all_values)
+
+        if returning:
+            return returned_rows